@@ -2,88 +2,182 @@
 
 from __future__ import annotations
 
+import os
 import shlex
 import subprocess
+from contextlib import asynccontextmanager
+from functools import lru_cache
 from pathlib import Path
-from typing import Any, Dict, List, Optional
+from typing import Annotated, Any, AsyncIterator, Awaitable, Callable, Dict, List, Optional, Type, TypeVar
 
-from fastapi import BackgroundTasks, FastAPI, HTTPException, status
-from fastapi.responses import FileResponse
+import msgspec
+import orjson
+from fastapi import BackgroundTasks, Depends, FastAPI, HTTPException, Request, status
+from fastapi.responses import ORJSONResponse, Response
 from fastapi.staticfiles import StaticFiles
-from pydantic import BaseModel, Field, field_validator
+from starlette.datastructures import QueryParams
 
 from .core import ApplicationCore
-from .media_catalog import MediaItem
 from .vlc_controller import VLCError
 
+_T = TypeVar("_T")
+_TimeOfDay = Annotated[str, msgspec.Meta(pattern=r"^\d{2}:\d{2}$")]
+_Weekday = Annotated[int, msgspec.Meta(ge=0, le=6)]
+_VERSIONED_CACHE_CONTROL = "public, max-age=31536000, immutable"
 
-class VolumeRequest(BaseModel):
-    level: int = Field(ge=0, le=100)
 
+class VolumeRequest(msgspec.Struct):
+    level: Annotated[int, msgspec.Meta(ge=0, le=100)]
 
-class InsertRequest(BaseModel):
+
+class InsertRequest(msgspec.Struct):
     filename: str
 
 
-class LanguageRequest(BaseModel):
+class LanguageRequest(msgspec.Struct):
     language: str
 
 
-class RcloneConfigRequest(BaseModel):
+class RcloneConfigRequest(msgspec.Struct):
     token: str
     remote_path: Optional[str] = None
 
 
-class ScheduleRequest(BaseModel):
+class ScheduleRequest(msgspec.Struct):
     enabled: bool
-    start: str = Field(pattern=r"^\d{2}:\d{2}$")
-    end: str = Field(pattern=r"^\d{2}:\d{2}$")
-    days: List[int] = Field(default_factory=list)
-
-    @field_validator("days")
-    @classmethod
-    def _validate_days(cls, value: List[int]) -> List[int]:
-        if any((day < 0 or day > 6) for day in value):
-            raise ValueError("Days must be between 0 (Monday) and 6 (Sunday).")
-        return value
+    start: _TimeOfDay
+    end: _TimeOfDay
+    days: List[_Weekday] = msgspec.field(default_factory=list)
 
 
-class SyncScheduleRequest(BaseModel):
+class SyncScheduleRequest(msgspec.Struct):
     enabled: bool
-    time: str = Field(pattern=r"^\d{2}:\d{2}$")
+    time: _TimeOfDay
+
+
+class CachedStaticFiles(StaticFiles):
+    """StaticFiles that lets browsers keep versioned assets instead of refetching them.
+
+    The UI requests every asset as ``?v=<asset version>``, and the version changes
+    whenever a file under static/ or locales/ does, so those responses never go
+    stale. Unversioned requests are only revalidated (usually a bodiless 304).
+    """
+
+    def file_response(
+        self, full_path: Any, stat_result: os.stat_result, scope: Any, status_code: int = 200
+    ) -> Response:
+        response = super().file_response(full_path, stat_result, scope, status_code)
+        versioned = QueryParams(scope.get("query_string", b"")).get("v")
+        response.headers.setdefault(
+            "Cache-Control", _VERSIONED_CACHE_CONTROL if versioned else "no-cache"
+        )
+        return response
+
+
+def _asset_version(*directories: Path) -> str:
+    """Return a token that changes whenever any file under ``directories`` does."""
+    latest = 0
+    for directory in directories:
+        for path in directory.rglob("*"):
+            if path.is_file():
+                latest = max(latest, path.stat().st_mtime_ns)
+    return f"{latest:x}"
 
 
-class OperationResponse(BaseModel):
-    success: bool
-    message: str
-    details: Optional[Dict[str, Any]] = None
+def _json_body(model: Type[_T]) -> Callable[[Request], Awaitable[_T]]:
+    """Return a dependency decoding and validating the request body with msgspec."""
+    decoder = msgspec.json.Decoder(model)
+
+    async def _decode(request: Request) -> _T:
+        try:
+            return decoder.decode(await request.body())
+        except msgspec.DecodeError as exc:
+            # Same shape as FastAPI's own validation errors, which clients already parse.
+            detail = [{"loc": ["body"], "msg": str(exc), "type": "value_error"}]
+            raise HTTPException(status_code=422, detail=detail) from exc
+
+    return _decode
 
 
-def _media_item_to_dict(item: MediaItem) -> Dict[str, Any]:
+def _request_body(model: Type[msgspec.Struct]) -> Dict[str, Any]:
+    """Return ``openapi_extra`` documenting a body that ``_json_body`` decodes.
+
+    The body never reaches FastAPI's own parsing, so /docs would otherwise show no
+    schema. The request structs are flat, so the struct's component is self-contained.
+    """
+    _, components = msgspec.json.schema_components([model])
+    schema = components[model.__name__]
     return {
-        "name": item.name,
-        "size_bytes": item.size_bytes,
-        "modified_at": item.modified_at,
+        "requestBody": {"required": True, "content": {"application/json": {"schema": schema}}}
     }
 
 
-def create_app(core: ApplicationCore) -> FastAPI:
-    """Instantiate the FastAPI app with routes and dependencies."""
-    app = FastAPI(title="AVPPi", version="1.0.0")
+def _operation_response(
+    message: str, *, success: bool = True, details: Optional[Dict[str, Any]] = None
+) -> ORJSONResponse:
+    """Build an operation payload without a response-model validation pass."""
+    return ORJSONResponse(content={"success": success, "message": message, "details": details})
+
+
+def _static_operation_body(message: str) -> bytes:
+    return orjson.dumps({"success": True, "message": message, "details": None})
+
+
+# Fixed success payloads for the transport controls, encoded once at import.
+_PLAY_PAUSE_OK = _static_operation_body("Toggled play/pause")
+_NEXT_OK = _static_operation_body("Advanced to next video")
+_PREVIOUS_OK = _static_operation_body("Moved to previous video")
+
+
+def create_app(core_factory: Callable[[], ApplicationCore]) -> FastAPI:
+    """Instantiate the FastAPI app; the core is built during startup."""
+
+    @asynccontextmanager
+    async def _lifespan(app: FastAPI) -> AsyncIterator[None]:
+        core = core_factory()
+        app.state.core = core
+        core.initialise()
+        yield
+        core.watchdog.stop()
+        core.state.save()
+
+    app = FastAPI(
+        title="AVPPi",
+        version="1.0.0",
+        default_response_class=ORJSONResponse,
+        lifespan=_lifespan,
+    )
     app_dir = Path(__file__).resolve().parent
     static_dir = app_dir / "web" / "static"
     template_path = app_dir / "web" / "templates" / "index.html"
     locales_dir = Path(__file__).resolve().parents[1] / "locales"
-    app.mount("/static", StaticFiles(directory=static_dir), name="static")
-    app.mount("/locales", StaticFiles(directory=locales_dir), name="locales")
-
-    @app.on_event("startup")
-    async def _startup() -> None:
-        core.initialise()
+    app.mount("/static", CachedStaticFiles(directory=static_dir), name="static")
+    app.mount("/locales", CachedStaticFiles(directory=locales_dir), name="locales")
+    # Rendered once: the asset version only changes with a deploy, which restarts us.
+    index_html = template_path.read_bytes().replace(
+        b"{{asset_version}}", _asset_version(static_dir, locales_dir).encode("ascii")
+    )
 
     @app.get("/", include_in_schema=False)
-    async def index() -> FileResponse:
-        return FileResponse(template_path)
+    async def index() -> Response:
+        return Response(
+            content=index_html, media_type="text/html", headers={"Cache-Control": "no-cache"}
+        )
+
+    _register_routes(app)
+    return app
+
+
+def _get_core(request: Request) -> ApplicationCore:
+    """Return the core the lifespan built for this app."""
+    return request.app.state.core
+
+
+_Core = Annotated[ApplicationCore, Depends(_get_core)]
+
+
+def _register_routes(app: FastAPI) -> None:
+    """Attach the API routes; each resolves the current core per request."""
 
     def _wrap_vlc_call(action):
         try:
@@ -94,7 +188,7 @@ def create_app(core: ApplicationCore) -> FastAPI:
                 detail=str(exc),
             ) from exc
 
-    def _safe_status() -> Dict[str, Any]:
+    def _safe_status(core: ApplicationCore) -> Dict[str, Any]:
         try:
             return core.vlc.get_status()
         except VLCError as exc:
@@ -107,122 +201,126 @@ def create_app(core: ApplicationCore) -> FastAPI:
             }
 
     @app.get("/api/media")
-    async def list_media() -> Dict[str, Any]:
-        items = core.list_media()
-        return {"videos": [_media_item_to_dict(item) for item in items]}
+    async def list_media(core: _Core) -> Response:
+        videos = core.get_media_json_bytes()
+        return Response(content=b'{"videos":' + videos + b"}", media_type="application/json")
 
     @app.get("/api/status")
-    async def status() -> Dict[str, Any]:
-        media = core.list_media()
-        status_data = _safe_status()
-        return {
-            "vlc": status_data,
-            "language": core.state.get_language(),
-            "videos": [_media_item_to_dict(item) for item in media],
-        }
-
-    @app.post("/api/control/play-pause", response_model=OperationResponse)
-    async def play_pause() -> OperationResponse:
+    async def status(core: _Core) -> Response:
+        videos = core.get_media_json_bytes()
+        head = orjson.dumps({"vlc": _safe_status(core), "language": core.state.get_language()})
+        # Splice the cached catalogue into the freshly encoded object.
+        content = head[:-1] + b',"videos":' + videos + b"}"
+        return Response(content=content, media_type="application/json")
+
+    @app.post("/api/control/play-pause")
+    async def play_pause(core: _Core) -> Response:
         _wrap_vlc_call(core.vlc.pause_toggle)
-        return OperationResponse(success=True, message="Toggled play/pause")
+        return Response(content=_PLAY_PAUSE_OK, media_type="application/json")
 
-    @app.post("/api/control/next", response_model=OperationResponse)
-    async def next_track() -> OperationResponse:
+    @app.post("/api/control/next")
+    async def next_track(core: _Core) -> Response:
         _wrap_vlc_call(core.vlc.next_track)
-        return OperationResponse(success=True, message="Advanced to next video")
+        return Response(content=_NEXT_OK, media_type="application/json")
 
-    @app.post("/api/control/previous", response_model=OperationResponse)
-    async def previous_track() -> OperationResponse:
+    @app.post("/api/control/previous")
+    async def previous_track(core: _Core) -> Response:
         _wrap_vlc_call(core.vlc.previous_track)
-        return OperationResponse(success=True, message="Moved to previous video")
+        return Response(content=_PREVIOUS_OK, media_type="application/json")
 
-    @app.post("/api/control/volume", response_model=OperationResponse)
-    async def set_volume(payload: VolumeRequest) -> OperationResponse:
+    @app.post("/api/control/volume", openapi_extra=_request_body(VolumeRequest))
+    async def set_volume(core: _Core, payload: VolumeRequest = Depends(_json_body(VolumeRequest))) -> ORJSONResponse:
         _wrap_vlc_call(lambda: core.vlc.set_volume_percent(payload.level))
-        return OperationResponse(success=True, message="Volume updated")
+        return _operation_response("Volume updated")
 
-    @app.post("/api/playlist/insert", response_model=OperationResponse)
-    async def playlist_insert(payload: InsertRequest) -> OperationResponse:
+    @app.post("/api/playlist/insert", openapi_extra=_request_body(InsertRequest))
+    async def playlist_insert(core: _Core, payload: InsertRequest = Depends(_json_body(InsertRequest))) -> ORJSONResponse:
         inserted = core.insert_after_current(payload.filename)
         if not inserted:
             raise HTTPException(status_code=404, detail="Video not found")
-        return OperationResponse(success=True, message="Video inserted into playlist")
+        return _operation_response("Video inserted into playlist")
 
-    @app.post("/api/settings/language", response_model=OperationResponse)
-    async def change_language(payload: LanguageRequest) -> OperationResponse:
+    @app.post("/api/settings/language", openapi_extra=_request_body(LanguageRequest))
+    async def change_language(core: _Core, payload: LanguageRequest = Depends(_json_body(LanguageRequest))) -> ORJSONResponse:
         core.state.set_language(payload.language)
-        return OperationResponse(success=True, message="Language updated")
-
-    @app.post("/api/system/rescan", response_model=OperationResponse)
-    async def rescan_library() -> OperationResponse:
-        media = _wrap_vlc_call(core.rescan_media)
-        return OperationResponse(
-            success=True,
-            message="Media library rescanned",
-            details={"count": len(media)},
-        )
+        return _operation_response("Language updated")
+
+    @app.post("/api/system/rescan")
+    async def rescan_library(core: _Core) -> ORJSONResponse:
+        try:
+            media = await core.rescan_media_async()
+        except VLCError as exc:
+            raise HTTPException(status_code=500, detail=str(exc)) from exc
+        return _operation_response("Media library rescanned", details={"count": len(media)})
 
-    @app.post("/api/system/restart", response_model=OperationResponse)
-    async def restart_system(background: BackgroundTasks) -> OperationResponse:
+    @app.post("/api/system/restart")
+    async def restart_system(core: _Core, background: BackgroundTasks) -> ORJSONResponse:
         if not core.config.allow_shutdown_commands:
             raise HTTPException(status_code=403, detail="Restart disabled by configuration")
         background.add_task(_run_restart_command, core.config.restart_command)
-        return OperationResponse(success=True, message="System restart initiated")
+        return _operation_response("System restart initiated")
 
-    @app.post("/api/rclone/sync", response_model=OperationResponse)
-    async def rclone_sync() -> OperationResponse:
+    @app.post("/api/rclone/sync")
+    async def rclone_sync(core: _Core) -> ORJSONResponse:
         if core.rclone.is_busy():
             raise HTTPException(status_code=409, detail="An rclone operation is already running")
         try:
             result = await core.sync_and_reload()
         except VLCError as exc:
             raise HTTPException(status_code=500, detail=str(exc)) from exc
-        return OperationResponse(success=result.success, message="Sync completed", details={"returncode": result.returncode})
+        return _operation_response("Sync completed", success=result.success, details={"returncode": result.returncode})
 
-    @app.post("/api/rclone/test", response_model=OperationResponse)
-    async def rclone_test() -> OperationResponse:
+    @app.post("/api/rclone/test")
+    async def rclone_test(core: _Core) -> ORJSONResponse:
         if core.rclone.is_busy():
             raise HTTPException(status_code=409, detail="An rclone operation is already running")
         result = await core.run_rclone_test()
-        return OperationResponse(success=result.success, message="Test completed", details={"returncode": result.returncode})
+        return _operation_response("Test completed", success=result.success, details={"returncode": result.returncode})
 
-    @app.post("/api/rclone/config", response_model=OperationResponse)
-    async def rclone_config(payload: RcloneConfigRequest) -> OperationResponse:
+    @app.post("/api/rclone/config", openapi_extra=_request_body(RcloneConfigRequest))
+    async def rclone_config(core: _Core, payload: RcloneConfigRequest = Depends(_json_body(RcloneConfigRequest))) -> ORJSONResponse:
         if core.rclone.is_busy():
             raise HTTPException(status_code=409, detail="Cannot update config during rclone job")
         path = await core.update_rclone_config(payload.token, payload.remote_path)
-        return OperationResponse(success=True, message="Configuration saved", details={"path": str(path)})
+        return _operation_response("Configuration saved", details={"path": str(path)})
 
-    @app.post("/api/rclone/sanitize", response_model=OperationResponse)
-    async def rclone_sanitize() -> OperationResponse:
+    @app.post("/api/rclone/sanitize")
+    async def rclone_sanitize(core: _Core) -> ORJSONResponse:
         if core.rclone.is_busy():
             raise HTTPException(status_code=409, detail="Cannot sanitize while rclone job is running")
         sanitized = await core.sanitize_media()
-        return OperationResponse(
-            success=True,
-            message="Sanitisation completed",
+        return _operation_response(
+            "Sanitisation completed",
             details={"processed": sanitized, "count": len(sanitized)},
         )
 
     @app.get("/api/rclone/logs")
-    async def rclone_logs() -> Dict[str, List[str]]:
-        return {"logs": core.rclone.get_recent_logs()}
+    async def rclone_logs(core: _Core) -> ORJSONResponse:
+        return ORJSONResponse(content={"logs": core.rclone.get_recent_logs()})
 
-    @app.get("/api/settings/summary")
-    async def settings_summary() -> Dict[str, Any]:
+    @lru_cache(maxsize=1)
+    def _settings_summary(core: ApplicationCore, version: int) -> bytes:
+        # ``version`` only keys the cache; any state mutation bumps it.
         rclone = core.state.get_rclone_settings()
-        return {
-            "language": core.state.get_language(),
-            "remote_name": rclone.get("remote_name"),
-            "remote_path": rclone.get("remote_path"),
-            "local_directory": str(core.config.media_directory),
-            "rclone_config_path": str(core.config.rclone_config_path),
-            "schedule": core.state.get_schedule_settings(),
-            "sync_schedule": core.state.get_sync_schedule_settings(),
-        }
-
-    @app.post("/api/settings/schedule", response_model=OperationResponse)
-    async def update_schedule(payload: ScheduleRequest) -> OperationResponse:
+        return orjson.dumps(
+            {
+                "language": core.state.get_language(),
+                "remote_name": rclone.get("remote_name"),
+                "remote_path": rclone.get("remote_path"),
+                "local_directory": str(core.config.media_directory),
+                "rclone_config_path": str(core.config.rclone_config_path),
+                "schedule": core.state.get_schedule_settings(),
+                "sync_schedule": core.state.get_sync_schedule_settings(),
+            }
+        )
+
+    @app.get("/api/settings/summary")
+    async def settings_summary(core: _Core) -> Response:
+        content = _settings_summary(core, core.state.version)
+        return Response(content=content, media_type="application/json")
+
+    @app.post("/api/settings/schedule", openapi_extra=_request_body(ScheduleRequest))
+    async def update_schedule(core: _Core, payload: ScheduleRequest = Depends(_json_body(ScheduleRequest))) -> ORJSONResponse:
         try:
             core.state.update_schedule_settings(
                 enabled=payload.enabled,
@@ -233,17 +331,16 @@ def create_app(core: ApplicationCore) -> FastAPI:
         except ValueError as exc:
             raise HTTPException(status_code=400, detail=str(exc)) from exc
         core.scheduler.request_check()
-        return OperationResponse(success=True, message="Schedule updated")
+        return _operation_response("Schedule updated")
 
-    @app.post("/api/settings/sync-schedule", response_model=OperationResponse)
-    async def update_sync_schedule(payload: SyncScheduleRequest) -> OperationResponse:
+    @app.post("/api/settings/sync-schedule", openapi_extra=_request_body(SyncScheduleRequest))
+    async def update_sync_schedule(core: _Core, payload: SyncScheduleRequest = Depends(_json_body(SyncScheduleRequest))) -> ORJSONResponse:
         try:
             core.state.update_sync_schedule_settings(enabled=payload.enabled, time=payload.time)
         except ValueError as exc:
             raise HTTPException(status_code=400, detail=str(exc)) from exc
-        return OperationResponse(success=True, message="Sync schedule updated")
-
-    return app
+        core.sync_scheduler.request_check()
+        return _operation_response("Sync schedule updated")
 
 
 def _run_restart_command(command: str) -> None:
@@ -9,9 +9,11 @@ import sys
 import threading
 import time
 from pathlib import Path
-from typing import List, Optional
+from typing import Dict, List, Optional
 
-from .media_catalog import MediaItem, scan_media
+import orjson
+
+from .media_catalog import MediaItem, media_item_to_dict, scan_media
 from .rclone_manager import RcloneManager, RcloneCommandResult
 from .settings import AppConfig
 from .state_manager import StateManager
@@ -33,7 +35,9 @@ class ApplicationCore:
         self.vlc = VLCController(config, self.state)
         self.rclone = RcloneManager(config, self.state)
         self._media_items: List[MediaItem] = []
-        self._media_lock = threading.RLock()
+        self._media_json_cache: Optional[bytes] = None
+        self._media_index: Dict[str, MediaItem] = {}
+        self._media_lock = threading.Lock()
         self._sync_lock = asyncio.Lock()
         self.scheduler = PlaybackScheduler(self.state, self.vlc, self._logger.getChild("scheduler"))
         self.sync_scheduler = SyncScheduler(self.state, self, self._logger)
@@ -54,8 +58,7 @@ class ApplicationCore:
         except RuntimeError:
             self._loop = None
         media = scan_media(self.config.media_directory)
-        with self._media_lock:
-            self._media_items = media
+        self._store_media(media)
         if media:
             try:
                 self.vlc.load_playlist(media)
@@ -79,12 +82,22 @@ class ApplicationCore:
         with self._media_lock:
             return list(self._media_items)
 
+    def get_media_json_bytes(self) -> bytes:
+        """Return the media catalogue pre-serialised as a JSON array."""
+        with self._media_lock:
+            return self._media_json_cache or b"[]"
+
+    def _store_media(self, media: List[MediaItem]) -> None:
+        encoded = orjson.dumps([media_item_to_dict(item) for item in media])
+        index = {item.name: item for item in media}
+        with self._media_lock:
+            self._media_items = media
+            self._media_json_cache = encoded
+            self._media_index = index
+
     def get_media_by_name(self, filename: str) -> Optional[MediaItem]:
         with self._media_lock:
-            for item in self._media_items:
-                if item.name == filename:
-                    return item
-        return None
+            return self._media_index.get(filename)
 
     def insert_after_current(self, filename: str) -> bool:
         item = self.get_media_by_name(filename)
@@ -99,8 +112,7 @@ class ApplicationCore:
 
     def rescan_media(self, autoplay: bool = True) -> List[MediaItem]:
         media = scan_media(self.config.media_directory)
-        with self._media_lock:
-            self._media_items = media
+        self._store_media(media)
         if media:
             try:
                 self.vlc.load_playlist(media)
@@ -115,13 +127,17 @@ class ApplicationCore:
                 self._logger.warning("Failed to stop VLC during rescan: %s", exc)
         return media
 
+    async def rescan_media_async(self, autoplay: bool = True) -> List[MediaItem]:
+        """Run :meth:`rescan_media` in a worker thread to keep the event loop free."""
+        return await asyncio.to_thread(self.rescan_media, autoplay)
+
     async def sync_and_reload(self) -> RcloneCommandResult:
         """Run rclone sync, rebuild playlist, and restart playback."""
         async with self._sync_lock:
             self._logger.info("Starting sync operation")
             result = await asyncio.to_thread(self.rclone.sync_media)
             self._logger.info("Sync result: success=%s", result.success)
-            media = self.rescan_media(autoplay=False)
+            media = await self.rescan_media_async(autoplay=False)
             if media:
                 try:
                     self.vlc.play()
@@ -142,7 +158,7 @@ class ApplicationCore:
             self._logger.info("Starting media sanitisation")
             self.vlc.stop()
             sanitized = await asyncio.to_thread(self.sanitizer.sanitize)
-            media = self.rescan_media()
+            media = await self.rescan_media_async()
             if media:
                 self.vlc.play()
             return sanitized
@@ -159,6 +175,7 @@ class ApplicationCore:
 
         def _exec_restart() -> None:
             time.sleep(1.0)
+            self.state.save()
             python = sys.executable
             args = [
                 python,
@@ -2,20 +2,50 @@
 
 from __future__ import annotations
 
+import atexit
 import logging
 import logging.config
+import os
+import queue
+from logging.handlers import QueueHandler, QueueListener
 from pathlib import Path
+from typing import List
+
+_LISTENERS: List[QueueListener] = []
+
+
+def _stop_listeners() -> None:
+    while _LISTENERS:
+        _LISTENERS.pop().stop()
+
+
+atexit.register(_stop_listeners)
+
+
+def _move_to_listener(logger: logging.Logger) -> None:
+    """Put every handler of a logger behind one QueueHandler and a listener thread."""
+    targets = list(logger.handlers)
+    if not targets:
+        return
+    log_queue: "queue.SimpleQueue[logging.LogRecord]" = queue.SimpleQueue()
+    for target in targets:
+        logger.removeHandler(target)
+    logger.addHandler(QueueHandler(log_queue))
+    listener = QueueListener(log_queue, *targets, respect_handler_level=True)
+    listener.start()
+    _LISTENERS.append(listener)
 
 
 def setup_logging(log_directory: Path) -> None:
     """Configure application logging targets."""
     log_directory.mkdir(parents=True, exist_ok=True)
+    # Keep existing logs: RotatingFileHandler appends and rotates on its own.
+    # A single directory read tells us which files still need creating.
+    with os.scandir(log_directory) as entries:
+        existing = {entry.name for entry in entries if entry.is_file()}
     for filename in ("app.log", "playback.log", "rclone.log"):
-        target = log_directory / filename
-        try:
-            target.write_text("", encoding="utf-8")
-        except OSError:
-            target.touch(exist_ok=True)
+        if filename not in existing:
+            (log_directory / filename).touch(exist_ok=True)
 
     log_config = {
         "version": 1,
@@ -82,5 +112,9 @@ def setup_logging(log_directory: Path) -> None:
         },
     }
 
+    _stop_listeners()
     logging.config.dictConfig(log_config)
+    # rclone emits one record per output line during syncs; keep both the file and the
+    # console writes (stdout is kiosk.log in deployment) off the thread draining the pipe.
+    _move_to_listener(logging.getLogger("avppi.rclone"))
     logging.getLogger("avppi").info("Logging initialised; log directory: %s", log_directory)
@@ -2,6 +2,8 @@
 
 from __future__ import annotations
 
+from typing import Dict
+
 import uvicorn
 
 from .api import create_app
@@ -13,8 +15,33 @@ from .settings import ROOT_DIR, load_config
 CONFIG = load_config()
 setup_logging(CONFIG.log_directory)
 STATE_FILE = ROOT_DIR / "data" / "state.json"
-CORE = ApplicationCore(CONFIG, STATE_FILE)
-app = create_app(CORE)
+
+
+def _build_core() -> ApplicationCore:
+    return ApplicationCore(CONFIG, STATE_FILE)
+
+
+# The core (VLC, rclone, schedulers, state file) is built in the app lifespan,
+# not at import time.
+app = create_app(_build_core)
+
+
+def _server_implementations() -> Dict[str, str]:
+    """Prefer uvloop/httptools when installed, otherwise keep uvicorn defaults."""
+    options: Dict[str, str] = {}
+    try:
+        import uvloop  # noqa: F401
+    except ImportError:
+        pass
+    else:
+        options["loop"] = "uvloop"
+    try:
+        import httptools  # noqa: F401
+    except ImportError:
+        pass
+    else:
+        options["http"] = "httptools"
+    return options
 
 
 def main() -> None:
@@ -25,6 +52,7 @@ def main() -> None:
         port=CONFIG.api_port,
         reload=False,
         log_level="info",
+        **_server_implementations(),
     )
 
 
@@ -3,14 +3,16 @@
 from __future__ import annotations
 
 import os
-from dataclasses import dataclass
+from dataclasses import dataclass, field
+from functools import lru_cache
+from operator import attrgetter
 from pathlib import Path
-from typing import Iterable, List
+from typing import Any, Dict, Iterable, List
 
 SUPPORTED_EXTENSIONS = {".mp4", ".mov", ".m4v", ".mkv", ".avi", ".webm"}
 
 
-@dataclass
+@dataclass(frozen=True)
 class MediaItem:
     """Represents a video file discovered in the media directory."""
 
@@ -18,6 +20,24 @@ class MediaItem:
     path: Path
     size_bytes: int
     modified_at: float
+    _sort_key: str = field(init=False, repr=False, compare=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "_sort_key", self.name.lower())
+
+
+@lru_cache(maxsize=4096)
+def media_item_to_dict(item: MediaItem) -> Dict[str, Any]:
+    """Return the JSON-friendly representation exposed by the API.
+
+    Results are cached per item value, so unchanged files are reused across
+    rescans; callers must treat the returned dict as read-only.
+    """
+    return {
+        "name": item.name,
+        "size_bytes": item.size_bytes,
+        "modified_at": item.modified_at,
+    }
 
 
 def is_supported_video(path: Path) -> bool:
@@ -28,20 +48,26 @@ def is_supported_video(path: Path) -> bool:
 def scan_media(directory: Path) -> List[MediaItem]:
     """Return a sorted list of available media items."""
     items: List[MediaItem] = []
-    if not directory.exists():
+    try:
+        scanner = os.scandir(directory)
+    except FileNotFoundError:
         return items
-    for entry in directory.iterdir():
-        if entry.is_file() and is_supported_video(entry):
+    with scanner as entries:
+        for entry in entries:
+            if os.path.splitext(entry.name)[1].lower() not in SUPPORTED_EXTENSIONS:
+                continue
+            if not entry.is_file():
+                continue
             stat = entry.stat()
             items.append(
                 MediaItem(
                     name=entry.name,
-                    path=entry,
+                    path=Path(entry.path),
                     size_bytes=stat.st_size,
                     modified_at=stat.st_mtime,
                 )
             )
-    items.sort(key=lambda item: item.name.lower())
+    items.sort(key=attrgetter("_sort_key"))
     return items
 
 
@@ -3,25 +3,29 @@
 from __future__ import annotations
 
 import logging
+import os
 import subprocess
 import threading
+import time
 from collections import deque
 from dataclasses import dataclass
-from datetime import datetime
 from pathlib import Path
-from typing import Deque, Iterable, List, Optional
+from typing import Any, Deque, Dict, Iterable, List, Optional, Tuple
 
 from .settings import AppConfig
 from .state_manager import StateManager
 
+# Lines of rclone output kept for the result; the full output goes to the log.
+OUTPUT_TAIL_LINES = 50
+
 
 @dataclass
 class RcloneCommandResult:
     """Result of an rclone invocation."""
 
     success: bool
-    stdout: str
-    stderr: str
+    stdout: str  # last OUTPUT_TAIL_LINES lines only; stderr is merged into it
+    stderr: str  # always empty, see stdout
     returncode: int
 
 
@@ -35,34 +39,42 @@ class RcloneManager:
         self._lock = threading.RLock()
         self._log_buffer: Deque[str] = deque(maxlen=500)
         self._active_job: Optional[str] = None
+        self._settings_cache: Optional[Tuple[int, Dict[str, Any]]] = None
 
     def _append_log(self, message: str) -> None:
-        timestamp = datetime.utcnow().strftime("%Y-%m-%d %H:%M:%S")
-        formatted = f"{timestamp} UTC | {message}"
+        tm = time.gmtime()
+        formatted = (
+            f"{tm.tm_year:04d}-{tm.tm_mon:02d}-{tm.tm_mday:02d} "
+            f"{tm.tm_hour:02d}:{tm.tm_min:02d}:{tm.tm_sec:02d} UTC | {message}"
+        )
         self._log_buffer.append(formatted)
         self._logger.info(message)
 
     def get_recent_logs(self) -> List[str]:
-        with self._lock:
-            return list(self._log_buffer)
+        # deque.append and list(deque) are atomic under the GIL, so readers do
+        # not need to contend with the rclone thread on _lock.
+        return list(self._log_buffer)
 
     def _run_rclone(self, args: Iterable[str]) -> RcloneCommandResult:
         command = [self._config.rclone_binary, *args]
         self._append_log(f"Running command: {' '.join(command)}")
-        process = subprocess.run(  # noqa: S603
+        output: Deque[str] = deque(maxlen=OUTPUT_TAIL_LINES)
+        with subprocess.Popen(  # noqa: S603
             command,
-            capture_output=True,
+            stdout=subprocess.PIPE,
+            stderr=subprocess.STDOUT,
             text=True,
-            check=False,
-        )
-        stdout = process.stdout.strip()
-        stderr = process.stderr.strip()
-        if stdout:
-            for line in stdout.splitlines():
-                self._append_log(f"rclone stdout | {line}")
-        if stderr:
-            for line in stderr.splitlines():
-                self._append_log(f"rclone stderr | {line}")
+            bufsize=1,
+        ) as process:
+            for raw_line in process.stdout or ():
+                line = raw_line.rstrip()
+                if not line:
+                    continue
+                output.append(line)
+                self._append_log(f"rclone | {line}")
+            process.wait()
+        stdout = "\n".join(output)
+        stderr = ""
         success = process.returncode == 0
         if success:
             self._append_log("Command completed successfully")
@@ -75,8 +87,17 @@ class RcloneManager:
             returncode=process.returncode,
         )
 
-    def _build_remote_path(self, remote_path: Optional[str] = None) -> str:
+    def _rclone_settings(self) -> Dict[str, Any]:
+        cached = self._settings_cache
+        version = self._state.version
+        if cached is not None and cached[0] == version:
+            return cached[1]
         settings = self._state.get_rclone_settings()
+        self._settings_cache = (version, settings)
+        return settings
+
+    def _build_remote_path(self, remote_path: Optional[str] = None) -> str:
+        settings = self._rclone_settings()
         remote_name = settings.get("remote_name") or self._config.remote_name
         remote_dir = remote_path or settings.get("remote_path") or self._config.remote_path
         return f"{remote_name}:{remote_dir}"
@@ -125,11 +146,18 @@ class RcloneManager:
             "scope = drive.file\n"
             "token = " + token.strip() + "\n"
         )
-        with config_path.open("w", encoding="utf-8") as handle:
-            handle.write(content)
+        # The file holds an OAuth token: keep it owner-only and write it in one call.
+        # The open() mode only applies on creation, so tighten an existing file too.
+        fd = os.open(config_path, os.O_WRONLY | os.O_CREAT | os.O_TRUNC, 0o600)
+        try:
+            os.fchmod(fd, 0o600)
+            os.write(fd, content.encode("utf-8"))
+        finally:
+            os.close(fd)
         if remote_path:
             self._state.update_rclone_settings(remote_path=remote_path)
         self._state.update_rclone_settings(token=token)
+        self._settings_cache = None
         self._append_log("rclone configuration was updated")
         return config_path
 
@@ -4,23 +4,59 @@ from __future__ import annotations
 
 import json
 import logging
-import shutil
+import os
 import subprocess
-import tempfile
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
 from pathlib import Path
-from typing import Iterable, List
+from typing import Dict, Iterator, List, Optional, Tuple
 
 from .settings import AppConfig
 
+try:  # optional: in-process probing without spawning ffprobe
+    import av
+except ImportError:  # pragma: no cover - depends on the deployment
+    av = None  # type: ignore[assignment]
+
 
 class SanitizerError(Exception):
     """Raised when a sanitisation step fails."""
 
 
-SAFE_PIXEL_FORMATS = {"yuv420p"}
-SAFE_PROFILES = {"High", "Main", "Baseline"}
-SAFE_CODECS = {"h264"}
-VIDEO_EXTENSIONS = {".mp4", ".mov", ".m4v", ".mkv", ".avi"}
+SAFE_PIXEL_FORMATS = frozenset({"yuv420p"})
+SAFE_PROFILES = frozenset({"High", "Main", "Baseline"})
+SAFE_CODECS = frozenset({"h264"})
+VIDEO_EXTENSIONS = frozenset({".mp4", ".mov", ".m4v", ".mkv", ".avi"})
+VIDEO_EXTENSIONS_NOEXT = frozenset(ext[1:] for ext in VIDEO_EXTENSIONS)
+PROBE_WORKERS = 4
+NVENC_PROBE_TIMEOUT_SECONDS = 30
+_HEADER_ONLY_OPTIONS = {"probesize": "32", "analyzeduration": "0"}
+# AVFieldOrder values, spelled the way ffprobe reports them. Index 0 is "unknown",
+# which a header-only open usually reports, so it maps to None (ask ffprobe).
+_FIELD_ORDER_NAMES = (None, "progressive", "tt", "bb", "tb", "bt")
+
+
+def _ffprobe_field_order(value: object) -> Optional[str]:
+    """Map a PyAV field order (enum, int or name) to ffprobe's spelling, or None."""
+    name = getattr(value, "name", value)
+    if isinstance(name, str):
+        name = name.lower()
+        return name if name in _FIELD_ORDER_NAMES else None
+    try:
+        index = int(value)  # type: ignore[call-overload]
+    except (TypeError, ValueError):
+        return None
+    return _FIELD_ORDER_NAMES[index] if 0 <= index < len(_FIELD_ORDER_NAMES) else None
+
+
+@dataclass(frozen=True)
+class ProbeResult:
+    """Video stream properties relevant to playback safety."""
+
+    codec: str
+    profile: str
+    pix_fmt: str
+    field_order: str
 
 
 class MediaSanitizer:
@@ -29,32 +65,217 @@ class MediaSanitizer:
     def __init__(self, config: AppConfig, logger: logging.Logger | None = None) -> None:
         self._media_dir = Path(config.media_directory)
         self._logger = (logger or logging.getLogger("avppi")).getChild("sanitizer")
+        self._use_hardware_accel = config.use_hardware_accel
+        self._nvenc_preset = config.nvenc_preset
+        self._x264_preset = config.x264_preset
+        self._x264_crf = config.x264_crf
+        self._nvenc_available: Optional[bool] = None
+        self._cuda_filters_available: Optional[bool] = None
+        # Cleared once PyAV turns out not to expose field order; ffprobe then does it all.
+        self._pyav_probe = av is not None
+        self._max_concurrent_transcodes = config.max_concurrent_transcodes
+        # (path, mtime_ns, size) -> needs transcode; rclone rewrites bump mtime.
+        self._probe_cache: Dict[Tuple[str, int, int], bool] = {}
+
+    def _ffmpeg_listing(self, flag: str) -> str:
+        """Return the output of ``ffmpeg -<flag>`` (e.g. encoders), or '' on failure."""
+        try:
+            result = subprocess.run(
+                ["ffmpeg", "-hide_banner", f"-{flag}"],
+                stdin=subprocess.DEVNULL,
+                capture_output=True,
+                text=True,
+                check=True,
+            )
+        except (OSError, subprocess.CalledProcessError) as exc:
+            self._logger.warning("Unable to list ffmpeg %s: %s", flag, exc)
+            return ""
+        return result.stdout
+
+    def _has_nvenc(self) -> bool:
+        """Return True if h264_nvenc can actually encode here; probed once and cached."""
+        if self._nvenc_available is None:
+            self._nvenc_available = False
+            if self._use_hardware_accel and "h264_nvenc" in self._ffmpeg_listing("encoders"):
+                # Distribution builds list h264_nvenc whether or not a GPU is present.
+                self._nvenc_available = self._nvenc_test_encode()
+            self._logger.info(
+                "Sanitiser encoder: %s", "h264_nvenc" if self._nvenc_available else "libx264"
+            )
+        return self._nvenc_available
+
+    def _nvenc_test_encode(self) -> bool:
+        """Encode a single blank frame with h264_nvenc to confirm a usable GPU."""
+        try:
+            subprocess.run(
+                [
+                    "ffmpeg",
+                    "-hide_banner",
+                    "-loglevel",
+                    "error",
+                    "-f",
+                    "lavfi",
+                    "-i",
+                    "nullsrc",
+                    "-frames:v",
+                    "1",
+                    "-c:v",
+                    "h264_nvenc",
+                    "-f",
+                    "null",
+                    "-",
+                ],
+                stdin=subprocess.DEVNULL,
+                capture_output=True,
+                check=True,
+                timeout=NVENC_PROBE_TIMEOUT_SECONDS,
+            )
+        except subprocess.CalledProcessError as exc:
+            stderr = exc.stderr.decode("utf-8", "ignore").strip() if exc.stderr else ""
+            self._logger.info("h264_nvenc is listed but unusable: %s", stderr or exc)
+            return False
+        except (OSError, subprocess.TimeoutExpired) as exc:
+            self._logger.info("h264_nvenc test encode failed: %s", exc)
+            return False
+        return True
+
+    def _has_cuda_filters(self) -> bool:
+        """Return True if yadif_cuda and scale_cuda can keep frames in GPU memory."""
+        if self._cuda_filters_available is None:
+            filters = self._ffmpeg_listing("filters") if self._has_nvenc() else ""
+            self._cuda_filters_available = "yadif_cuda" in filters and "scale_cuda" in filters
+        return self._cuda_filters_available
 
     def sanitize(self) -> List[str]:
+        candidates = self._probe_all(list(self._iter_media_files()))
+        if not candidates:
+            return []
+        # Probe the encoder once, up front: the workers read these flags unlocked, and a
+        # probe racing a worker would send that worker's file to libx264.
+        self._has_nvenc()
+        self._has_cuda_filters()
+        workers = min(self._transcode_workers(), len(candidates))
         sanitized: List[str] = []
-        for media in self._iter_media_files():
-            if not self._needs_transcode(media):
-                continue
-            self._logger.info("Sanitising %s", media.name)
+        # ffmpeg runs out of process, so threads are enough to overlap the jobs.
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="sanitizer") as pool:
+            futures = [pool.submit(self._sanitize_file, media) for media in candidates]
             try:
-                self._transcode(media)
-                sanitized.append(media.name)
-            except SanitizerError:
+                for future in as_completed(futures):
+                    sanitized.append(future.result())
+            except BaseException:
+                for future in futures:
+                    future.cancel()
                 raise
-            except Exception as exc:  # pragma: no cover - defensive
-                raise SanitizerError(f"Failed to sanitise {media}: {exc}") from exc
         return sanitized
 
-    def _iter_media_files(self) -> Iterable[Path]:
-        if not self._media_dir.exists():
-            return []
-        return (path for path in self._media_dir.rglob("*") if self._is_candidate(path))
+    def _transcode_workers(self) -> int:
+        if self._max_concurrent_transcodes > 0:
+            return self._max_concurrent_transcodes
+        if self._has_nvenc():
+            # Consumer GPUs cap concurrent NVENC sessions; stay well below it.
+            return 2
+        return max(1, (os.cpu_count() or 1) // 2)
 
-    @staticmethod
-    def _is_candidate(path: Path) -> bool:
-        return path.is_file() and path.suffix.lower() in VIDEO_EXTENSIONS
+    def _sanitize_file(self, media: Path) -> str:
+        self._logger.info("Sanitising %s", media.name)
+        try:
+            self._transcode(media)
+        except SanitizerError:
+            raise
+        except Exception as exc:  # pragma: no cover - defensive
+            raise SanitizerError(f"Failed to sanitise {media}: {exc}") from exc
+        return media.name
+
+    def _iter_media_files(self) -> Iterator[Path]:
+        """Walk the media directory with os.scandir, yielding candidate video files."""
+        pending = [str(self._media_dir)]
+        while pending:
+            directory = pending.pop()
+            try:
+                scanner = os.scandir(directory)
+            except (FileNotFoundError, NotADirectoryError):
+                continue
+            except OSError as exc:
+                # e.g. an unreadable subdirectory: skip it rather than abort the pass.
+                self._logger.warning("Skipping %s: %s", directory, exc)
+                continue
+            with scanner as entries:
+                for entry in entries:
+                    if entry.is_dir(follow_symlinks=False):
+                        pending.append(entry.path)
+                        continue
+                    stem, dot, ext = entry.name.rpartition(".")
+                    if stem and dot and ext.lower() in VIDEO_EXTENSIONS_NOEXT and entry.is_file():
+                        yield Path(entry.path)
+
+    def _probe_all(self, paths: List[Path]) -> List[Path]:
+        """Return the paths that need transcoding.
+
+        Files are probed in-process with PyAV when it is installed; anything it
+        cannot describe falls back to ffprobe, run concurrently. Files whose
+        path, mtime and size are unchanged since a previous pass are not probed again.
+        """
+        keys: Dict[Path, Tuple[str, int, int]] = {}
+        for path in paths:
+            try:
+                st = path.stat()
+            except OSError:
+                continue
+            keys[path] = (str(path), st.st_mtime_ns, st.st_size)
+        cache = self._probe_cache
+        unknown = [path for path, key in keys.items() if key not in cache]
+        if unknown:
+            results: List[Optional[ProbeResult]] = (
+                list(self._probe_batch(unknown)) if self._pyav_probe else [None] * len(unknown)
+            )
+            missing = [path for path, result in zip(unknown, results) if result is None]
+            if missing:
+                workers = min(PROBE_WORKERS, len(missing))
+                with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="ffprobe") as pool:
+                    fallback = dict(zip(missing, pool.map(self._probe_ffprobe, missing)))
+                results = [
+                    result if result is not None else fallback[path]
+                    for path, result in zip(unknown, results)
+                ]
+            for path, result in zip(unknown, results):
+                cache[keys[path]] = not self._is_safe(result)
+        # Drop entries for files that were removed or rewritten since the last pass.
+        self._probe_cache = {key: cache[key] for key in keys.values()}
+        return [path for path, key in keys.items() if self._probe_cache[key]]
 
-    def _needs_transcode(self, path: Path) -> bool:
+    def _probe_batch(self, paths: List[Path]) -> Iterator[Optional[ProbeResult]]:
+        """Yield header-level stream details for each path using PyAV."""
+        for path in paths:
+            if not self._pyav_probe:
+                yield None
+                continue
+            try:
+                # Read only the container header; deep inspection is left to ffprobe.
+                with av.open(str(path), mode="r", options=_HEADER_ONLY_OPTIONS) as container:
+                    stream = container.streams.video[0]
+                    context = stream.codec_context
+                    if not hasattr(context, "field_order"):
+                        # Without it interlacing is undetectable, so every file would be
+                        # opened here and then probed again by ffprobe anyway.
+                        self._logger.info("PyAV does not expose field order; using ffprobe")
+                        self._pyav_probe = False
+                        yield None
+                        continue
+                    field_order = _ffprobe_field_order(context.field_order)
+                    if not context.pix_fmt or field_order is None:
+                        yield None
+                        continue
+                    yield ProbeResult(
+                        codec=context.name or "",
+                        profile=stream.profile or "",
+                        pix_fmt=context.pix_fmt,
+                        field_order=field_order,
+                    )
+            except Exception as exc:  # PyAV raises a family of FFmpeg errors
+                self._logger.debug("PyAV probe failed for %s: %s", path.name, exc)
+                yield None
+
+    def _probe_ffprobe(self, path: Path) -> Optional[ProbeResult]:
         try:
             result = subprocess.run(
                 [
@@ -69,71 +290,123 @@ class MediaSanitizer:
                     "json",
                     str(path),
                 ],
+                stdin=subprocess.DEVNULL,
                 capture_output=True,
-                text=True,
                 check=True,
             )
         except subprocess.CalledProcessError as exc:
-            self._logger.warning("ffprobe failed for %s: %s", path.name, exc.stderr.strip())
-            return True
+            stderr = exc.stderr.decode("utf-8", "ignore").strip() if exc.stderr else ""
+            self._logger.warning("ffprobe failed for %s: %s", path.name, stderr)
+            return None
 
         try:
-            data = json.loads(result.stdout or "{}")
+            # json.loads accepts bytes and decodes UTF-8 in C; no str round-trip.
+            data = json.loads(result.stdout or b"{}")
             stream = data.get("streams", [{}])[0]
         except (json.JSONDecodeError, IndexError):
-            return True
-
-        codec = str(stream.get("codec_name", "")).lower()
-        profile = str(stream.get("profile", ""))
-        pix_fmt = str(stream.get("pix_fmt", "")).lower()
-        field = str(stream.get("field_order", "")).lower()
-
-        if codec not in SAFE_CODECS:
-            return True
-        if profile and profile not in SAFE_PROFILES:
-            return True
-        if pix_fmt and pix_fmt not in SAFE_PIXEL_FORMATS:
-            return True
-        if field and field != "progressive":
-            return True
-        return False
+            return None
+
+        # ffprobe already reports codec, pixel format and field order in lower case.
+        return ProbeResult(
+            codec=str(stream.get("codec_name", "")),
+            profile=str(stream.get("profile", "")),
+            pix_fmt=str(stream.get("pix_fmt", "")),
+            field_order=str(stream.get("field_order", "")),
+        )
+
+    @staticmethod
+    def _is_safe(probe: Optional[ProbeResult]) -> bool:
+        if probe is None:
+            return False
+        if probe.codec not in SAFE_CODECS:
+            return False
+        if probe.profile and probe.profile not in SAFE_PROFILES:
+            return False
+        if probe.pix_fmt and probe.pix_fmt not in SAFE_PIXEL_FORMATS:
+            return False
+        if probe.field_order and probe.field_order != "progressive":
+            return False
+        return True
 
     def _transcode(self, path: Path) -> None:
-        tmp_dir = path.parent
-        with tempfile.NamedTemporaryFile(prefix=path.stem, suffix=".mp4", dir=tmp_dir, delete=False) as tmp:
-            tmp_path = Path(tmp.name)
+        # Same directory as the source, so os.replace is an atomic same-filesystem rename.
+        tmp_path = path.with_name(f".{path.name}.sanitize.{os.getpid()}.mp4")
         try:
-            cmd = [
-                "ffmpeg",
-                "-y",
-                "-i",
-                str(path),
-                "-c:v",
-                "libx264",
-                "-preset",
-                "medium",
-                "-crf",
-                "20",
-                "-pix_fmt",
-                "yuv420p",
-                "-vf",
-                "yadif=0:-1:0",
-                "-c:a",
-                "aac",
-                "-b:a",
-                "192k",
-                "-movflags",
-                "+faststart",
-                str(tmp_path),
-            ]
-            subprocess.run(cmd, check=True, capture_output=True)
-            backup = path.with_suffix(path.suffix + ".bak")
-            shutil.move(path, backup)
-            shutil.move(tmp_path, path)
-            backup.unlink(missing_ok=True)
+            if self._has_nvenc():
+                try:
+                    self._run_ffmpeg(self._build_transcode_command(path, tmp_path, hardware=True))
+                    os.replace(tmp_path, path)
+                    return
+                except subprocess.CalledProcessError as exc:
+                    # NVDEC rejects some inputs (4:2:2, 10-bit h264); libx264 takes anything.
+                    stderr = exc.stderr.decode("utf-8", "ignore").strip() if exc.stderr else ""
+                    self._logger.warning(
+                        "NVENC transcode failed for %s, retrying with libx264: %s",
+                        path.name,
+                        stderr.splitlines()[-1] if stderr else exc,
+                    )
+            self._run_ffmpeg(self._build_transcode_command(path, tmp_path, hardware=False))
+            os.replace(tmp_path, path)
         except subprocess.CalledProcessError as exc:
             raise SanitizerError(
                 f"ffmpeg failed for {path.name}: {exc.stderr.decode('utf-8', 'ignore') if exc.stderr else exc}"
             ) from exc
         finally:
             tmp_path.unlink(missing_ok=True)
+
+    @staticmethod
+    def _run_ffmpeg(cmd: List[str]) -> None:
+        subprocess.run(cmd, check=True, stdin=subprocess.DEVNULL, capture_output=True)
+
+    def _build_transcode_command(self, source: Path, target: Path, *, hardware: bool) -> List[str]:
+        decode: List[str] = []
+        video_filters = ["-pix_fmt", "yuv420p", "-vf", "yadif=0:-1:0"]
+        if hardware:
+            encode = [
+                "-c:v",
+                "h264_nvenc",
+                "-preset",
+                self._nvenc_preset,
+                "-tune",
+                "hq",
+                "-rc",
+                "vbr",
+                "-cq",
+                "23",
+            ]
+            if self._has_cuda_filters():
+                # Decode, deinterlace and convert on the GPU so frames never leave VRAM.
+                decode = ["-hwaccel", "cuda", "-hwaccel_output_format", "cuda"]
+                video_filters = ["-vf", "yadif_cuda=0:-1:0,scale_cuda=format=yuv420p"]
+            else:
+                decode = ["-hwaccel", "cuda"]
+        else:
+            encode = [
+                "-c:v",
+                "libx264",
+                "-preset",
+                self._x264_preset,
+                "-crf",
+                str(self._x264_crf),
+                # Let x264 size its own thread pool; cap the filter graph (yadif) at half the cores.
+                "-threads",
+                "0",
+                "-filter_threads",
+                str(max(1, (os.cpu_count() or 1) // 2)),
+            ]
+        return [
+            "ffmpeg",
+            "-y",
+            *decode,
+            "-i",
+            str(source),
+            *encode,
+            *video_filters,
+            "-c:a",
+            "aac",
+            "-b:a",
+            "192k",
+            "-movflags",
+            "+faststart",
+            str(target),
+        ]
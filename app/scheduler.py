@@ -5,11 +5,19 @@ from __future__ import annotations
 import logging
 import threading
 from datetime import datetime, time
-from typing import Dict, Optional, Sequence
+from typing import Any, FrozenSet, Optional
 
-from .state_manager import StateManager
+from .state_manager import StateManager, parse_hhmm
 from .vlc_controller import VLCController
 
+# Bounds for the sleep between evaluations. The upper bound keeps the thread
+# robust against wall-clock jumps (NTP, DST) that a single long sleep would miss.
+MIN_WAIT_SECONDS = 1.0
+MAX_WAIT_SECONDS = 3600.0
+ERROR_RETRY_SECONDS = 30.0
+MINUTES_PER_DAY = 24 * 60
+MINUTES_PER_WEEK = 7 * MINUTES_PER_DAY
+
 
 class PlaybackScheduler:
     """Check schedule configuration and toggle playback accordingly."""
@@ -27,6 +35,14 @@ class PlaybackScheduler:
         self._wake = threading.Event()
         self._thread: Optional[threading.Thread] = None
         self._last_active: Optional[bool] = None
+        # Parsed schedule, refreshed only when StateManager.schedule_version moves.
+        self._cached_version: Optional[int] = None
+        self._cached_enabled = False
+        self._cached_start: Optional[time] = None
+        self._cached_end: Optional[time] = None
+        self._cached_days: FrozenSet[int] = frozenset()
+        # One bit per minute of the week (Monday 00:00 = bit 0) set inside the window.
+        self._window_bitmap = bytearray(MINUTES_PER_WEEK // 8)
 
     def start(self) -> None:
         if self._thread and self._thread.is_alive():
@@ -47,26 +63,46 @@ class PlaybackScheduler:
 
     def _run(self) -> None:
         while not self._stop.is_set():
+            timeout = ERROR_RETRY_SECONDS
             try:
-                self._evaluate_window()
+                timeout = self._evaluate_window()
             except Exception:  # pragma: no cover - defensive logging
                 self._logger.exception("Playback schedule tick failed")
             finally:
-                self._wait_with_wake(30)
+                self._wait_with_wake(timeout)
 
-    def _wait_with_wake(self, timeout: int) -> None:
+    def _wait_with_wake(self, timeout: float) -> None:
         self._wake.wait(timeout=timeout)
         self._wake.clear()
 
-    def _evaluate_window(self) -> None:
+    def _refresh_schedule(self) -> None:
+        version = self._state.schedule_version
+        if version == self._cached_version:
+            return
         config = self._state.get_schedule_settings()
-        if not config.get("enabled"):
+        self._cached_enabled = bool(config.get("enabled"))
+        try:
+            self._cached_start = self._parse_time(str(config.get("start", "00:00")))
+            self._cached_end = self._parse_time(str(config.get("end", "00:00")))
+        except ValueError:
+            self._cached_start = self._cached_end = None
+        self._cached_days = self._coerce_days(config.get("days", []))
+        self._window_bitmap = self._build_window_bitmap(
+            self._cached_start, self._cached_end, self._cached_days
+        )
+        self._cached_version = version
+
+    def _evaluate_window(self) -> float:
+        """Apply the schedule and return the seconds to sleep before the next check."""
+        self._refresh_schedule()
+        if not self._cached_enabled:
             if self._last_active is False:
                 self._logger.info("Schedule disabled – resuming playback")
                 self._vlc.play()
             self._last_active = None
-            return
-        active = self._is_within_window(config, datetime.now())
+            return MAX_WAIT_SECONDS
+        now = datetime.now()
+        active = self._is_within_window(now)
         previous = self._last_active
         self._last_active = active
         if previous is None:
@@ -77,38 +113,62 @@ class PlaybackScheduler:
         elif not active and previous:
             self._logger.info("Schedule window ended – pausing playback")
             self._vlc.pause()
+        return self._seconds_until_next_transition(now)
+
+    def _seconds_until_next_transition(self, now: datetime) -> float:
+        """Return the delay until the window bitmap next flips, clamped to the wait bounds.
+
+        Scanning the bitmap also catches the midnight edges of all-day windows and
+        the days excluded from the schedule, which the start/end times alone miss.
+        """
+        index = self._minute_index(now)
+        active = self._bit_set(index)
+        for step in range(1, int(MAX_WAIT_SECONDS // 60) + 1):
+            if self._bit_set((index + step) % MINUTES_PER_WEEK) != active:
+                delay = step * 60 - now.second - now.microsecond / 1_000_000
+                return max(MIN_WAIT_SECONDS, delay)
+        return MAX_WAIT_SECONDS
 
     @staticmethod
     def _parse_time(value: str) -> time:
-        return datetime.strptime(value, "%H:%M").time()
+        return parse_hhmm(value)
 
-    def _is_within_window(self, config: Dict[str, object], now: datetime) -> bool:
-        try:
-            start = self._parse_time(str(config.get("start", "00:00")))
-            end = self._parse_time(str(config.get("end", "00:00")))
-        except ValueError:
-            return False
-        days = self._coerce_days(config.get("days", []))
-        if not days:
-            return False
-        weekday = now.weekday()
-        current_time = now.time()
-        if start == end:
-            return weekday in days
-        if start < end:
-            return weekday in days and start <= current_time < end
-        # Overnight schedule (e.g. 20:00 -> 06:00)
-        if weekday in days and current_time >= start:
-            return True
-        previous_day = (weekday - 1) % 7
-        if previous_day in days and current_time < end:
-            return True
-        return False
+    def _is_within_window(self, now: datetime) -> bool:
+        return self._bit_set(self._minute_index(now))
+
+    @staticmethod
+    def _minute_index(now: datetime) -> int:
+        return now.weekday() * MINUTES_PER_DAY + now.hour * 60 + now.minute
+
+    def _bit_set(self, index: int) -> bool:
+        return bool(self._window_bitmap[index >> 3] & (1 << (index & 7)))
+
+    @staticmethod
+    def _build_window_bitmap(
+        start: Optional[time], end: Optional[time], days: FrozenSet[int]
+    ) -> bytearray:
+        bitmap = bytearray(MINUTES_PER_WEEK // 8)
+        if start is None or end is None:
+            return bitmap
+        start_minute = start.hour * 60 + start.minute
+        end_minute = end.hour * 60 + end.minute
+        if start_minute == end_minute:
+            first_minute, span = 0, MINUTES_PER_DAY
+        else:
+            # Overnight windows (e.g. 20:00 -> 06:00) wrap into the following day.
+            first_minute = start_minute
+            span = (end_minute - start_minute) % MINUTES_PER_DAY
+        for day in days:
+            first = day * MINUTES_PER_DAY + first_minute
+            for offset in range(span):
+                index = (first + offset) % MINUTES_PER_WEEK
+                bitmap[index >> 3] |= 1 << (index & 7)
+        return bitmap
 
     @staticmethod
-    def _coerce_days(days: object) -> Sequence[int]:
+    def _coerce_days(days: Any) -> FrozenSet[int]:
         try:
-            candidates = {int(day) for day in days}  # type: ignore[arg-type]
+            candidates = {int(day) for day in days}
         except TypeError:
-            return []
-        return sorted(day for day in candidates if 0 <= day <= 6)
+            return frozenset()
+        return frozenset(day for day in candidates if 0 <= day <= 6)
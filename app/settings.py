@@ -2,13 +2,20 @@
 
 from __future__ import annotations
 
+import json
 import os
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List
 
 import yaml
 
+try:  # libyaml-backed loader, much faster than the pure-Python one
+    from yaml import CSafeLoader as _SafeLoader
+except ImportError:  # pragma: no cover - depends on how PyYAML was built
+    from yaml import SafeLoader as _SafeLoader  # type: ignore[assignment]
+
 
 ROOT_DIR = Path(__file__).resolve().parents[1]
 DEFAULT_CONFIG_PATH = ROOT_DIR / "config" / "app_config.yaml"
@@ -32,6 +39,11 @@ class AppConfig:
     restart_command: str
     allow_shutdown_commands: bool
     max_playlist_items: int
+    use_hardware_accel: bool
+    nvenc_preset: str
+    x264_preset: str
+    x264_crf: int
+    max_concurrent_transcodes: int
 
 
 def _ensure_path(path_value: Any) -> Path:
@@ -45,13 +57,28 @@ def _ensure_path(path_value: Any) -> Path:
 def _load_yaml(path: Path) -> Dict[str, Any]:
     if not path.exists():
         raise FileNotFoundError(f"Configuration file not found: {path}")
-    with path.open("r", encoding="utf-8") as handle:
-        return yaml.safe_load(handle) or {}
+    text = path.read_text(encoding="utf-8")
+    # Machine-written configs may be plain JSON, which json parses far faster; a YAML
+    # flow mapping such as ``{media_directory: /tmp/m}`` also starts with "{".
+    if text.lstrip().startswith("{"):
+        try:
+            return json.loads(text)
+        except json.JSONDecodeError:
+            pass
+    return yaml.load(text, Loader=_SafeLoader) or {}
 
 
 def load_config(config_path: Path | None = None) -> AppConfig:
     """Load the application configuration from YAML."""
     path = config_path or Path(os.environ.get("AVPPI_CONFIG_PATH", DEFAULT_CONFIG_PATH))
+    if not path.exists():
+        raise FileNotFoundError(f"Configuration file not found: {path}")
+    return _load_config_cached(path, path.stat().st_mtime_ns)
+
+
+@lru_cache(maxsize=8)
+def _load_config_cached(path: Path, mtime_ns: int) -> AppConfig:
+    # ``mtime_ns`` only keys the cache so an edited file is parsed again.
     data = _load_yaml(path)
 
     return AppConfig(
@@ -71,4 +98,9 @@ def load_config(config_path: Path | None = None) -> AppConfig:
         restart_command=str(data.get("restart_command", "sudo /sbin/reboot")),
         allow_shutdown_commands=bool(data.get("allow_shutdown_commands", False)),
         max_playlist_items=int(data.get("max_playlist_items", 500)),
+        use_hardware_accel=bool(data.get("use_hardware_accel", True)),
+        nvenc_preset=str(data.get("nvenc_preset", "p4")),
+        x264_preset=str(data.get("x264_preset", "faster")),
+        x264_crf=int(data.get("x264_crf", 20)),
+        max_concurrent_transcodes=int(data.get("max_concurrent_transcodes", 0)),
     )
@@ -3,27 +3,57 @@
 from __future__ import annotations
 
 import json
+import logging
+import os
 import threading
-from datetime import datetime
+import time
+from datetime import time as dtime
+from functools import lru_cache
 from pathlib import Path
 from typing import Any, Dict, List, Optional
 
-from copy import deepcopy
+import orjson
 
 from .settings import AppConfig
 
+# Setters only mark the state dirty; a writer thread persists it after this
+# delay so bursts of updates (e.g. a volume slider drag) become one write.
+FLUSH_DELAY_SECONDS = 0.25
+
+
+@lru_cache(maxsize=256)
+def parse_hhmm(value: str) -> dtime:
+    """Parse a strict ``HH:MM`` (24h) string; raises ValueError otherwise."""
+    if len(value) != 5 or value[2] != ":" or not (value[:2].isdigit() and value[3:].isdigit()):
+        raise ValueError(f"Invalid HH:MM time: {value!r}")
+    hours = int(value[:2])
+    minutes = int(value[3:])
+    if not (0 <= hours < 24 and 0 <= minutes < 60):
+        raise ValueError(f"Invalid HH:MM time: {value!r}")
+    return dtime(hours, minutes)
+
 
 class StateManager:
     """Thread-safe JSON backed state storage."""
 
     def __init__(self, state_path: Path, config: AppConfig) -> None:
         self._path = state_path
-        self._lock = threading.RLock()
+        self._lock = threading.Lock()
+        # Serialises disk writes so an older snapshot never replaces a newer one,
+        # without holding _lock (and blocking readers) during file I/O.
+        self._write_lock = threading.Lock()
         self._state: Dict[str, Any] = {}
         self._config = config
+        self._version = 0
+        self._schedule_version = 0
+        self._logger = logging.getLogger("avppi.state")
+        self._dirty = threading.Event()
         self._load_or_create()
+        self._writer = threading.Thread(target=self._flush_loop, name="StateWriter", daemon=True)
+        self._writer.start()
 
     def _load_or_create(self) -> None:
+        self._path.parent.mkdir(parents=True, exist_ok=True)
         if self._path.exists():
             try:
                 with self._path.open("r", encoding="utf-8") as handle:
@@ -31,7 +61,6 @@ class StateManager:
             except json.JSONDecodeError:
                 self._state = {}
         else:
-            self._path.parent.mkdir(parents=True, exist_ok=True)
             self._state = {}
         self._state.setdefault("language", self._config.default_language)
         self._state.setdefault(
@@ -45,7 +74,7 @@ class StateManager:
         self._state.setdefault("volume_level", 80)
         self._state.setdefault("schedule", self._default_schedule())
         self._state.setdefault("sync_schedule", self._default_sync_schedule())
-        self._persist_unlocked()
+        self._persist()
 
     def _default_schedule(self) -> Dict[str, Any]:
         return {
@@ -62,14 +91,46 @@ class StateManager:
             "last_run_date": "",
         }
 
-    def _persist_unlocked(self) -> None:
-        self._path.parent.mkdir(parents=True, exist_ok=True)
-        with self._path.open("w", encoding="utf-8") as handle:
-            json.dump(self._state, handle, indent=2)
+    def _persist(self) -> None:
+        with self._write_lock:
+            with self._lock:
+                data = orjson.dumps(self._state, option=orjson.OPT_INDENT_2)
+            self._write_file(data)
+
+    def _write_file(self, data: bytes) -> None:
+        tmp_path = self._path.with_suffix(".tmp")
+        with tmp_path.open("wb") as handle:
+            handle.write(data)
+        os.replace(tmp_path, self._path)
+
+    def _commit_unlocked(self) -> None:
+        self._version += 1
+        self._dirty.set()
+
+    def _flush_loop(self) -> None:
+        while True:
+            self._dirty.wait()
+            time.sleep(FLUSH_DELAY_SECONDS)
+            self._dirty.clear()
+            try:
+                self._persist()
+            except OSError:
+                self._logger.exception("Failed to persist state to %s", self._path)
+
+    @property
+    def version(self) -> int:
+        """Monotonic counter bumped on every state mutation."""
+        return self._version
+
+    @property
+    def schedule_version(self) -> int:
+        """Counter bumped whenever the playback schedule is updated."""
+        return self._schedule_version
 
     def save(self) -> None:
-        with self._lock:
-            self._persist_unlocked()
+        """Write the state immediately, bypassing the debounce (e.g. on shutdown)."""
+        self._dirty.clear()
+        self._persist()
 
     def get_language(self) -> str:
         with self._lock:
@@ -77,28 +138,34 @@ class StateManager:
 
     def set_language(self, language: str) -> None:
         with self._lock:
+            if self._state.get("language") == language:
+                return
             self._state["language"] = language
-            self._persist_unlocked()
+            self._commit_unlocked()
 
     def get_volume_level(self) -> int:
         with self._lock:
             return int(self._state.get("volume_level", 80))
 
     def set_volume_level(self, level: int) -> None:
+        level = int(level)
         with self._lock:
-            self._state["volume_level"] = int(level)
-            self._persist_unlocked()
+            if self._state.get("volume_level") == level:
+                return
+            self._state["volume_level"] = level
+            self._commit_unlocked()
 
     def get_schedule_settings(self) -> Dict[str, Any]:
         with self._lock:
-            schedule = deepcopy(self._state.get("schedule", self._default_schedule()))
-            schedule["enabled"] = bool(schedule.get("enabled", False))
-            schedule["start"] = schedule.get("start", "08:00")
-            schedule["end"] = schedule.get("end", "20:00")
-            schedule["days"] = sorted(
-                {int(day) for day in schedule.get("days", list(range(7))) if 0 <= int(day) <= 6}
-            )
-            return schedule
+            raw = self._state.get("schedule") or {}
+            return {
+                "enabled": bool(raw.get("enabled", False)),
+                "start": raw.get("start", "08:00"),
+                "end": raw.get("end", "20:00"),
+                "days": sorted(
+                    {int(day) for day in raw.get("days", range(7)) if 0 <= int(day) <= 6}
+                ),
+            }
 
     def update_schedule_settings(
         self,
@@ -109,7 +176,9 @@ class StateManager:
         days: Optional[List[int]] = None,
     ) -> None:
         with self._lock:
-            schedule = self._state.setdefault("schedule", self._default_schedule())
+            current = self._state.get("schedule") or self._default_schedule()
+            # Work on a copy so a validation error leaves the stored schedule intact.
+            schedule = dict(current)
             if enabled is not None:
                 schedule["enabled"] = bool(enabled)
             if start is not None:
@@ -121,15 +190,20 @@ class StateManager:
                 if schedule.get("enabled") and not cleaned:
                     raise ValueError("At least one day must be selected when the schedule is enabled.")
                 schedule["days"] = cleaned
-            self._persist_unlocked()
+            if schedule == self._state.get("schedule"):
+                return
+            self._state["schedule"] = schedule
+            self._schedule_version += 1
+            self._commit_unlocked()
 
     def get_sync_schedule_settings(self) -> Dict[str, Any]:
         with self._lock:
-            schedule = deepcopy(self._state.get("sync_schedule", self._default_sync_schedule()))
-            schedule["enabled"] = bool(schedule.get("enabled", True))
-            schedule["time"] = schedule.get("time", "06:00")
-            schedule["last_run_date"] = schedule.get("last_run_date", "")
-            return schedule
+            raw = self._state.get("sync_schedule") or {}
+            return {
+                "enabled": bool(raw.get("enabled", True)),
+                "time": raw.get("time", "06:00"),
+                "last_run_date": raw.get("last_run_date", ""),
+            }
 
     def update_sync_schedule_settings(
         self,
@@ -138,28 +212,34 @@ class StateManager:
         time: Optional[str] = None,
     ) -> None:
         with self._lock:
-            schedule = self._state.setdefault("sync_schedule", self._default_sync_schedule())
+            schedule = dict(self._state.get("sync_schedule") or self._default_sync_schedule())
             if enabled is not None:
                 schedule["enabled"] = bool(enabled)
             if time is not None:
                 schedule["time"] = self._validate_time_string(time)
             if schedule.get("enabled", True):
                 schedule["last_run_date"] = ""
-            self._persist_unlocked()
+            if schedule == self._state.get("sync_schedule"):
+                return
+            self._state["sync_schedule"] = schedule
+            self._commit_unlocked()
 
     def set_sync_last_run(self, date_str: str) -> None:
         with self._lock:
             schedule = self._state.setdefault("sync_schedule", self._default_sync_schedule())
+            if schedule.get("last_run_date") == date_str:
+                return
             schedule["last_run_date"] = date_str
-            self._persist_unlocked()
+            self._commit_unlocked()
 
     @staticmethod
     def _validate_time_string(value: str) -> str:
+        value = value.strip()
         try:
-            parsed = datetime.strptime(value.strip(), "%H:%M")
+            parse_hhmm(value)
         except ValueError as exc:
             raise ValueError("Time must be provided as HH:MM (24h).") from exc
-        return parsed.strftime("%H:%M")
+        return value
 
     def get_rclone_settings(self) -> Dict[str, Any]:
         with self._lock:
@@ -172,10 +252,13 @@ class StateManager:
         self, *, token: Optional[str] = None, remote_path: Optional[str] = None
     ) -> None:
         with self._lock:
-            rclone = self._state.setdefault("rclone", {})
+            rclone = dict(self._state.get("rclone") or {})
             if token is not None:
                 rclone["token"] = token
             if remote_path is not None:
                 rclone["remote_path"] = remote_path
             rclone.setdefault("remote_name", self._config.remote_name)
-            self._persist_unlocked()
+            if rclone == self._state.get("rclone"):
+                return
+            self._state["rclone"] = rclone
+            self._commit_unlocked()
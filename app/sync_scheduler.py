@@ -4,12 +4,17 @@ from __future__ import annotations
 
 import logging
 import threading
-from datetime import datetime, time
+from datetime import datetime, time, timedelta
 from typing import Optional
 
 import asyncio
 
-from .state_manager import StateManager
+from .state_manager import StateManager, parse_hhmm
+
+# Sleep bounds between evaluations; the cap keeps wall-clock jumps visible.
+MIN_WAIT_SECONDS = 1.0
+MAX_WAIT_SECONDS = 3600.0
+RETRY_SECONDS = 60.0
 
 
 class SyncScheduler:
@@ -25,7 +30,10 @@ class SyncScheduler:
         self._core = core
         self._logger = (logger or logging.getLogger("avppi")).getChild("sync_scheduler")
         self._stop = threading.Event()
+        self._wake = threading.Event()
         self._thread: Optional[threading.Thread] = None
+        self._cached_target_raw: Optional[str] = None
+        self._cached_target: Optional[time] = None
 
     def start(self) -> None:
         if self._thread and self._thread.is_alive():
@@ -36,36 +44,51 @@ class SyncScheduler:
 
     def stop(self) -> None:
         self._stop.set()
+        self._wake.set()
         if self._thread:
             self._thread.join(timeout=1)
 
+    def request_check(self) -> None:
+        """Wake the scheduler so the new configuration is applied quickly."""
+        self._wake.set()
+
     def _run(self) -> None:
         while not self._stop.is_set():
+            timeout = RETRY_SECONDS
             try:
-                self._evaluate()
+                timeout = self._evaluate()
             except Exception:  # pragma: no cover - defensive
                 self._logger.exception("Unexpected exception in sync scheduler loop")
             finally:
-                self._stop.wait(timeout=60)
+                self._wake.wait(timeout=timeout)
+                self._wake.clear()
 
-    def _evaluate(self) -> None:
+    def _evaluate(self) -> float:
+        """Run the daily sync if due and return the seconds until the next check."""
         config = self._state.get_sync_schedule_settings()
         if not config.get("enabled"):
-            return
-        target = self._parse_time(str(config.get("time", "06:00")))
+            return MAX_WAIT_SECONDS
+        target = self._target_time(str(config.get("time", "06:00")))
         now = datetime.now()
-        if now.time() < target:
-            return
+        scheduled = datetime.combine(now.date(), target)
+        if now < scheduled:
+            return self._clamp_wait((scheduled - now).total_seconds())
         last_run = config.get("last_run_date") or ""
         today = now.date().isoformat()
-        if last_run == today:
-            return
-        if self._core.rclone.is_busy():
-            self._logger.info("Skipping scheduled sync because rclone is already running")
-            return
-        self._logger.info("Scheduled rclone sync triggered at %s", now.strftime("%H:%M"))
-        if self._trigger_sync():
+        if last_run != today:
+            if self._core.rclone.is_busy():
+                self._logger.info("Skipping scheduled sync because rclone is already running")
+                return RETRY_SECONDS
+            self._logger.info("Scheduled rclone sync triggered at %s", now.strftime("%H:%M"))
+            if not self._trigger_sync():
+                return RETRY_SECONDS
             self._state.set_sync_last_run(today)
+            now = datetime.now()
+        return self._clamp_wait((scheduled + timedelta(days=1) - now).total_seconds())
+
+    @staticmethod
+    def _clamp_wait(seconds: float) -> float:
+        return max(MIN_WAIT_SECONDS, min(MAX_WAIT_SECONDS, seconds))
 
     def _trigger_sync(self) -> bool:
         loop = getattr(self._core, "loop", None)
@@ -80,9 +103,15 @@ class SyncScheduler:
         self._logger.warning("Cannot run scheduled sync: event loop unavailable")
         return False
 
+    def _target_time(self, raw: str) -> time:
+        if raw != self._cached_target_raw or self._cached_target is None:
+            self._cached_target = self._parse_time(raw)
+            self._cached_target_raw = raw
+        return self._cached_target
+
     @staticmethod
     def _parse_time(value: str) -> time:
-        return datetime.strptime(value, "%H:%M").time()
+        return parse_hhmm(value)
 
 
 __all__ = ["SyncScheduler"]
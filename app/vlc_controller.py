@@ -3,31 +3,129 @@
 from __future__ import annotations
 
 import logging
+import os
 import threading
 import time
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, List, Optional
 from urllib.parse import unquote
 
 import vlc
 
+try:
+    from fastrlock.rlock import FastRLock as _RLock
+except ImportError:  # pragma: no cover - optional accelerator
+    _RLock = threading.RLock
+
 from .media_catalog import MediaItem, build_vlc_playlist_args
 from .settings import AppConfig
 from .state_manager import StateManager
 
+# Status polling (UI + watchdog) is served from a snapshot at most this old.
+SNAPSHOT_TTL_SECONDS = 0.25
+
 
 class VLCError(Exception):
     """Base exception for VLC control issues."""
 
 
-@dataclass
+@dataclass(frozen=True, slots=True)
 class PlaybackSnapshot:
     media: str
     position_ms: int
     state: str
 
 
+class _ReadWriteLock:
+    """Shared reads, exclusive re-entrant writes; an active writer holds off new readers."""
+
+    def __init__(self) -> None:
+        self._writer_mutex = _RLock()
+        self._cond = threading.Condition(threading.Lock())
+        self._readers = 0
+        # Bumped after every write so readers can tell whether cached state is stale.
+        self.generation = 0
+        self._writer: Optional[int] = None
+        self._write_depth = 0
+        self.read = _ReadSide(self)
+        self.write = _WriteSide(self)
+
+    def acquire_read(self) -> None:
+        me = threading.get_ident()
+        with self._cond:
+            if self._writer == me:
+                # The writing thread may call read-side helpers.
+                self._write_depth += 1
+                return
+            while self._writer is not None:
+                self._cond.wait()
+            self._readers += 1
+
+    def release_read(self) -> None:
+        with self._cond:
+            if self._writer == threading.get_ident():
+                self._write_depth -= 1
+                return
+            self._readers -= 1
+            if not self._readers:
+                self._cond.notify_all()
+
+    def acquire_write(self) -> None:
+        self._writer_mutex.acquire()
+        with self._cond:
+            self._write_depth += 1
+            if self._write_depth == 1:
+                self._writer = threading.get_ident()
+                while self._readers:
+                    self._cond.wait()
+
+    def release_write(self) -> None:
+        with self._cond:
+            self._write_depth -= 1
+            if not self._write_depth:
+                self._writer = None
+                self.generation += 1
+                self._cond.notify_all()
+        self._writer_mutex.release()
+
+
+class _ReadSide:
+    __slots__ = ("_lock",)
+
+    def __init__(self, lock: _ReadWriteLock) -> None:
+        self._lock = lock
+
+    def __enter__(self) -> None:
+        self._lock.acquire_read()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._lock.release_read()
+
+
+class _WriteSide:
+    __slots__ = ("_lock",)
+
+    def __init__(self, lock: _ReadWriteLock) -> None:
+        self._lock = lock
+
+    def __enter__(self) -> None:
+        self._lock.acquire_write()
+
+    def __exit__(self, *exc_info: object) -> None:
+        self._lock.release_write()
+
+
+def _state_code(state: object) -> int:
+    """Integer code of a vlc.State.
+
+    python-vlc states are ctypes.c_uint subclasses without __int__, and every
+    get_state() call returns a fresh instance, so compare codes, never identity.
+    """
+    return int(getattr(state, "value", state))  # type: ignore[call-overload]
+
+
 def _build_state_labels() -> Dict[int, str]:
     labels = {
         "NothingSpecial": "nothing_special",
@@ -45,22 +143,45 @@ def _build_state_labels() -> Dict[int, str]:
         if state_value is None:
             continue
         try:
-            resolved[int(state_value)] = label
+            resolved[_state_code(state_value)] = label
         except (TypeError, ValueError):
             continue
     return resolved
 
 
+@lru_cache(maxsize=512)
+def _mrl_display(mrl: str) -> str:
+    """Display name for an MRL; polled constantly for a playlist-sized set of values."""
+    if mrl.startswith("file://"):
+        try:
+            return Path(unquote(mrl[7:])).name
+        except ValueError:
+            return unquote(mrl[7:])
+    return unquote(mrl)
+
+
 class VLCController:
     """Manage VLC playback via libVLC bindings."""
 
     _STATE_LABELS = _build_state_labels()
+    _PLAYING = _state_code(vlc.State.Playing)
 
     def __init__(self, config: AppConfig, state: StateManager) -> None:
         self._config = config
         self._state = state
         self._logger = logging.getLogger("avppi.playback")
-        self._media_lock = threading.RLock()
+        # Status reads run concurrently; anything touching the VLC stack or playlist writes.
+        self._lock = _ReadWriteLock()
+        self._read_lock = self._lock.read
+        self._write_lock = self._lock.write
+        # (lock generation, expiry, snapshot); replaced wholesale so reads need no lock.
+        self._snapshot_cache: Optional[tuple[int, float, PlaybackSnapshot]] = None
+        self._snapshot_lock = threading.Lock()
+        self._restart_lock = threading.Lock()
+        # Last position reported by VLC's TimeChanged event; long-polling snapshots wait on it.
+        self._position_changed = threading.Condition(threading.Lock())
+        self._event_position = -1
+        self._error_recovery = threading.Lock()
         (
             self._instance,
             self._media_list,
@@ -68,6 +189,10 @@ class VLCController:
             self._media_player,
         ) = self._build_vlc_stack()
         self._playlist: List[MediaItem] = []
+        # Normalised path per playlist entry (same order) and first index of each path,
+        # so freeze recovery never has to scan the whole playlist under the lock.
+        self._playlist_keys: List[str] = []
+        self._resolved: Dict[str, int] = {}
         self._current_background: Optional[vlc.Media] = None
 
     # Internal helpers -------------------------------------------------
@@ -80,12 +205,48 @@ class VLCController:
         player.set_media_list(media_list)
         media_player = player.get_media_player()
         player.set_playback_mode(vlc.PlaybackMode.loop)
+        events = media_player.event_manager()
+        events.event_attach(vlc.EventType.MediaPlayerTimeChanged, self._on_time_changed)
+        events.event_attach(vlc.EventType.MediaPlayerEncounteredError, self._on_encountered_error)
+        # get_time() reads -1 (clamped to 0) once stopped or between items, and libVLC
+        # sends no TimeChanged for either; mirror that so long-polls compare like with like.
+        events.event_attach(vlc.EventType.MediaPlayerStopped, self._on_position_reset)
+        events.event_attach(vlc.EventType.MediaPlayerMediaChanged, self._on_position_reset)
         return instance, media_list, player, media_player
 
-    def _release_vlc_stack(self) -> None:
-        """Release libVLC objects, ignoring errors."""
-        for attr in ("_media_player", "_player", "_media_list", "_instance"):
-            obj = getattr(self, attr, None)
+    def _on_time_changed(self, event: vlc.Event) -> None:
+        # Runs on a libVLC thread: no libVLC calls and nothing that can block here.
+        with self._position_changed:
+            self._event_position = event.u.new_time
+            self._position_changed.notify_all()
+
+    def _on_position_reset(self, event: vlc.Event) -> None:
+        with self._position_changed:
+            self._event_position = 0
+            self._position_changed.notify_all()
+
+    def _on_encountered_error(self, event: vlc.Event) -> None:
+        # libVLC must not be re-entered from its own event thread, so the unplayable
+        # item is dropped from a helper thread; one recovery at a time.
+        if self._error_recovery.acquire(blocking=False):
+            threading.Thread(
+                target=self._drop_failed_media, name="VLCErrorRecovery", daemon=True
+            ).start()
+
+    def _drop_failed_media(self) -> None:
+        try:
+            self.remove_current_media()
+        except Exception:
+            self._logger.exception("Failed to drop media after a VLC playback error")
+        finally:
+            self._error_recovery.release()
+
+    @staticmethod
+    def _release_vlc_stack(
+        stack: tuple[vlc.Instance, vlc.MediaList, vlc.MediaListPlayer, vlc.MediaPlayer]
+    ) -> None:
+        """Release libVLC objects (players first, instance last), ignoring errors."""
+        for obj in reversed(stack):
             if obj is None:
                 continue
             try:
@@ -97,10 +258,11 @@ class VLCController:
 
     def load_playlist(self, items: List[MediaItem]) -> None:
         """Replace VLC playlist with items from the media directory."""
-        self._set_playlist(items, start_index=0)
+        with self._write_lock:
+            self._set_playlist(items, start_index=0)
 
     def insert_after_current(self, item: MediaItem) -> None:
-        with self._media_lock:
+        with self._write_lock:
             try:
                 media = self._instance.media_new_path(str(item.path))
                 current_media = self._media_player.get_media()
@@ -111,36 +273,81 @@ class VLCController:
                 self._media_list.insert_media(media, target)
                 if target >= len(self._playlist):
                     self._playlist.append(item)
+                    self._playlist_keys.append(self._path_key(item.path))
                 else:
                     self._playlist.insert(target, item)
-                self._logger.info("Inserted %s at position %s", item.name, target)
+                    self._playlist_keys.insert(target, self._path_key(item.path))
+                self._index_playlist()
+                if self._logger.isEnabledFor(logging.INFO):
+                    self._logger.info("Inserted %s at position %s", item.name, target)
             except Exception as exc:  # pragma: no cover - libVLC exceptions are opaque
                 raise VLCError(f"Impossible d'insérer {item.name}: {exc}") from exc
 
-    def _clear_media_list(self) -> None:
-        self._media_list.lock()
+    @staticmethod
+    def _path_key(path: Path | str) -> str:
+        # The MRLs come from media_new_path(str(item.path)), so a pure string
+        # normalisation matches them without touching the filesystem.
+        return os.path.normpath(path)
+
+    def _index_playlist(self) -> None:
+        resolved: Dict[str, int] = {}
+        for index, key in enumerate(self._playlist_keys):
+            resolved.setdefault(key, index)
+        self._resolved = resolved
+
+    def _replace_media_list(self, medias: Iterable[vlc.Media]) -> None:
+        """Fill a fresh MediaList and swap it in, instead of emptying the old one."""
+        media_list = self._instance.media_list_new()
+        media_list.lock()
         try:
-            for index in reversed(range(self._media_list.count())):
-                self._media_list.remove_index(index)
+            for media in medias:
+                media_list.add_media(media)
         finally:
-            self._media_list.unlock()
+            media_list.unlock()
+        self._player.set_media_list(media_list)
+        previous, self._media_list = self._media_list, media_list
+        try:
+            previous.release()
+        except Exception:
+            pass
 
     def _load_background_clip(self) -> None:
-        background = self._instance.media_new(self._config.vlc_background_media)
-        self._clear_media_list()
-        self._media_list.add_media(background)
-        self._current_background = background
+        background = self._current_background
+        if background is None:
+            # Parsed once per libVLC instance; the MediaList only adds a reference.
+            background = self._instance.media_new(self._config.vlc_background_media)
+            self._current_background = background
+        self._replace_media_list((background,))
         self.play()
 
-    def _rebuild_media_list(self) -> None:
-        self._clear_media_list()
+    def _rebuild_media_list(self, keys: Optional[List[str]] = None) -> None:
+        """Reload the MediaList from the playlist, indexing normalised paths in the same pass."""
         if not self._playlist:
+            self._playlist_keys = []
+            self._resolved = {}
             self._logger.info("Playlist is empty; loading fallback background.")
             self._load_background_clip()
             return
-        for path in build_vlc_playlist_args(self._playlist):
-            media = self._instance.media_new_path(path)
-            self._media_list.add_media(media)
+        new_media_path = self._instance.media_new_path
+        path_key = self._path_key
+        medias: List[vlc.Media] = []
+        playlist_keys: List[str] = []
+        resolved: Dict[str, int] = {}
+        for index, path in enumerate(build_vlc_playlist_args(self._playlist)):
+            medias.append(new_media_path(path))
+            key = keys[index] if keys is not None else path_key(path)
+            playlist_keys.append(key)
+            resolved.setdefault(key, index)
+        self._playlist_keys = playlist_keys
+        self._resolved = resolved
+        self._replace_media_list(medias)
+
+    def _current_media_and_mrl(self) -> tuple[Optional[vlc.Media], str]:
+        """Return the playing media and its MRL ('' when nothing is loaded)."""
+        media = self._media_player.get_media()
+        if not media:
+            return None, ""
+        return media, media.get_mrl() or ""
 
     def _play_index(self, index: int) -> None:
         self._player.stop()
@@ -156,61 +363,112 @@ class VLCController:
     # Playback controls -------------------------------------------------
 
     def play(self) -> None:
-        with self._media_lock:
+        with self._write_lock:
             self._player.play()
 
     def pause_toggle(self) -> None:
-        with self._media_lock:
+        with self._write_lock:
             self._media_player.pause()
 
     def pause(self) -> None:
-        with self._media_lock:
+        with self._write_lock:
             self._media_player.set_pause(1)
 
     def stop(self) -> None:
-        with self._media_lock:
+        with self._write_lock:
             self._player.stop()
 
     def next_track(self) -> None:
-        with self._media_lock:
+        with self._write_lock:
             self._player.next()
 
     def previous_track(self) -> None:
-        with self._media_lock:
+        with self._write_lock:
             self._player.previous()
 
     def set_volume_percent(self, percent: int) -> None:
-        with self._media_lock:
+        with self._write_lock:
             self._media_player.audio_set_volume(percent)
             self._state.set_volume_level(percent)
 
     def get_volume_percent(self) -> int:
-        return max(0, self._media_player.audio_get_volume())
+        with self._read_lock:
+            return max(0, self._media_player.audio_get_volume())
 
     # Status -------------------------------------------------------------
 
     def get_status(self) -> Dict[str, str]:
-        media = self._media_player.get_media()
-        mrl = media.get_mrl() if media else ""
+        snapshot = self.get_snapshot()
         return {
-            "state": self._derive_state_label(),
+            "state": snapshot.state,
             "volume_percent": str(self.get_volume_percent()),
-            "current_track": self._mrl_to_display_name(mrl),
+            "current_track": snapshot.media,
         }
 
-    def get_snapshot(self) -> PlaybackSnapshot:
-        with self._media_lock:
-            media = self._media_player.get_media()
-            mrl = media.get_mrl() if media else ""
-            return PlaybackSnapshot(
-                media=self._mrl_to_display_name(mrl),
-                position_ms=max(0, self._media_player.get_time()),
-                state=self._derive_state_label(),
-            )
+    def get_snapshot(
+        self,
+        wait_for_change: Optional[tuple[int, float]] = None,
+        *,
+        min_delta_ms: int = 1,
+        cancel: Optional[threading.Event] = None,
+    ) -> PlaybackSnapshot:
+        """Return the playback snapshot, reusing one computed in the last 250 ms.
+
+        With ``wait_for_change=(position_ms, timeout)`` this long-polls instead: it
+        blocks until VLC reports a position at least ``min_delta_ms`` away from
+        ``position_ms`` (a new media item shows up as such a jump), ``cancel`` is set
+        or ``timeout`` seconds pass, and then returns a freshly computed snapshot.
+        """
+        if wait_for_change is not None:
+            position_ms, timeout = wait_for_change
+            with self._position_changed:
+                self._position_changed.wait_for(
+                    lambda: abs(self._event_position - position_ms) >= min_delta_ms
+                    or (cancel is not None and cancel.is_set()),
+                    timeout,
+                )
+            with self._snapshot_lock:
+                return self._refresh_snapshot()
+        cached = self._snapshot_cache
+        if self._snapshot_fresh(cached):
+            return cached[2]
+        with self._snapshot_lock:
+            cached = self._snapshot_cache
+            if self._snapshot_fresh(cached):
+                return cached[2]
+            return self._refresh_snapshot()
+
+    def _refresh_snapshot(self) -> PlaybackSnapshot:
+        """Compute a snapshot and publish it to every reader; needs ``_snapshot_lock``."""
+        with self._read_lock:
+            generation = self._lock.generation
+            snapshot = self._compute_snapshot()
+        self._snapshot_cache = (generation, time.monotonic() + SNAPSHOT_TTL_SECONDS, snapshot)
+        return snapshot
+
+    def wake_snapshot_waiters(self) -> None:
+        """Make long-polling get_snapshot calls re-check their ``cancel`` event now."""
+        with self._position_changed:
+            self._position_changed.notify_all()
+
+    def _snapshot_fresh(self, cached: Optional[tuple[int, float, PlaybackSnapshot]]) -> bool:
+        return (
+            cached is not None
+            and cached[0] == self._lock.generation
+            and time.monotonic() < cached[1]
+        )
+
+    def _compute_snapshot(self) -> PlaybackSnapshot:
+        _, mrl = self._current_media_and_mrl()
+        return PlaybackSnapshot(
+            media=self._mrl_to_display_name(mrl),
+            position_ms=max(0, self._media_player.get_time()),
+            state=self._derive_state_label(),
+        )
 
     def recover_playback(self, skip: bool = False) -> None:
         """Attempt to recover when playback appears stuck."""
-        with self._media_lock:
+        with self._write_lock:
             self._logger.warning("Attempting VLC recovery cycle%s", " + skip" if skip else "")
             self._player.stop()
             time.sleep(0.5)
@@ -221,62 +479,80 @@ class VLCController:
 
     def force_restart(self) -> None:
         """Rebuild the entire VLC stack and resume playback."""
-        with self._media_lock:
+        with self._restart_lock:
             self._logger.warning("Reinitialising VLC backend")
-            current_index = 0
-            current_media = self._media_player.get_media()
-            if current_media:
-                try:
-                    current_index = max(0, self._media_list.index_of_item(current_media))
-                except Exception:
-                    current_index = 0
-            playlist = list(self._playlist)
-            self._player.stop()
-            self._release_vlc_stack()
-            (
-                self._instance,
-                self._media_list,
-                self._player,
-                self._media_player,
-            ) = self._build_vlc_stack()
-            self._current_background = None
-            if playlist:
-                self._set_playlist(playlist, start_index=min(current_index, len(playlist) - 1))
-            else:
-                self._load_background_clip()
+            # Creating and tearing down libVLC instances is slow, so only the swap
+            # itself runs under the write lock; status reads keep being served meanwhile.
+            stack = self._build_vlc_stack()
+            with self._write_lock:
+                current_index = 0
+                current_media = self._media_player.get_media()
+                if current_media:
+                    try:
+                        current_index = max(0, self._media_list.index_of_item(current_media))
+                    except Exception:
+                        current_index = 0
+                self._player.stop()
+                previous = (self._instance, self._media_list, self._player, self._media_player)
+                (
+                    self._instance,
+                    self._media_list,
+                    self._player,
+                    self._media_player,
+                ) = stack
+                # The cached background belongs to the old instance.
+                previous_background, self._current_background = self._current_background, None
+                if self._playlist:
+                    self._set_playlist(
+                        self._playlist,
+                        start_index=min(current_index, len(self._playlist) - 1),
+                        keys=self._playlist_keys,
+                    )
+                else:
+                    self._load_background_clip()
+            self._release_vlc_stack(previous)
+            if previous_background is not None:
+                previous_background.release()
 
     def remove_current_media(self) -> Optional[str]:
-        """Remove the currently playing media from the playlist and rebuild."""
-        with self._media_lock:
-            media = self._media_player.get_media()
-            if not media:
-                return None
-            mrl = media.get_mrl()
+        """Remove the currently playing media from the playlist and play the next item."""
+        with self._write_lock:
+            _, mrl = self._current_media_and_mrl()
             if not mrl:
                 return None
             display_name = self._mrl_to_display_name(mrl)
-            target_path = Path(unquote(mrl[7:])) if mrl.startswith("file://") else Path(mrl)
-            before = len(self._playlist)
-            target_str = str(target_path.resolve())
-            new_playlist = [item for item in self._playlist if str(Path(item.path).resolve()) != target_str]
-            if len(new_playlist) == before:
+            target_str = self._path_key(unquote(mrl[7:]) if mrl.startswith("file://") else mrl)
+            removed_index = self._resolved.get(target_str)
+            if removed_index is None:
                 return None
             self._logger.warning("Removed problematic media '%s' from playlist", display_name)
-            removed_index = next(
-                (i for i, item in enumerate(self._playlist) if str(Path(item.path).resolve()) == target_str),
-                0,
-            )
-            self._playlist = new_playlist
-            if self._playlist:
-                next_index = removed_index if removed_index < len(self._playlist) else 0
-                self._set_playlist(self._playlist, start_index=next_index)
-            else:
+            indices = [i for i, key in enumerate(self._playlist_keys) if key == target_str]
+            if len(indices) == len(self._playlist):
+                self._playlist = []
+                self._playlist_keys = []
+                self._resolved = {}
                 self._load_background_clip()
+                return display_name
+            # Drop just the offending entries rather than reloading the whole list.
+            self._player.stop()
+            self._media_list.lock()
+            try:
+                for index in reversed(indices):
+                    self._media_list.remove_index(index)
+                    del self._playlist[index]
+                    del self._playlist_keys[index]
+            finally:
+                self._media_list.unlock()
+            self._index_playlist()
+            self._play_index(removed_index if removed_index < len(self._playlist) else 0)
             return display_name
 
     def _derive_state_label(self) -> str:
         """Combine multiple libVLC signals to get a user-friendly state."""
-        for raw in (self._player.get_state(), self._media_player.get_state()):
+        raw = self._player.get_state()
+        if getattr(raw, "value", None) == self._PLAYING:
+            return "playing"
+        for raw in (raw, self._media_player.get_state()):
             label = self._state_to_text(raw)
             if label not in ("unknown", "nothing_special", ""):
                 return label
@@ -286,10 +562,16 @@ class VLCController:
             return "paused"
         return "stopped"
 
-    def _state_to_text(self, state: Optional[vlc.State]) -> str:
+    def _state_to_text(
+        self, state: Optional[vlc.State], _labels: Dict[int, str] = _STATE_LABELS
+    ) -> str:
         """Convert VLC state to a lower-case string without relying on Enum.name."""
         if state is None:
             return "unknown"
+        try:
+            return _labels[getattr(state, "value", state)]
+        except (TypeError, KeyError):
+            pass
         name = getattr(state, "name", None)
         if isinstance(name, str):
             return self._normalize_state_name(name)
@@ -315,21 +597,15 @@ class VLCController:
         return lowered
 
     def _mrl_to_display_name(self, mrl: str) -> str:
-        if not mrl:
-            return ""
-        if mrl.startswith("file://"):
-            try:
-                return Path(unquote(mrl[7:])).name
-            except ValueError:
-                return unquote(mrl[7:])
-        return unquote(mrl)
+        return _mrl_display(mrl) if mrl else ""
 
-    def _set_playlist(self, items: List[MediaItem], start_index: int = 0) -> None:
+    def _set_playlist(
+        self, items: List[MediaItem], start_index: int = 0, keys: Optional[List[str]] = None
+    ) -> None:
         self._player.stop()
         self._playlist = list(items)
-        self._rebuild_media_list()
+        # An empty playlist makes _rebuild_media_list load and start the background clip.
+        self._rebuild_media_list(keys)
         if self._playlist:
             self._logger.info("Playlist loaded with %d items", len(self._playlist))
             self._play_index(min(start_index, len(self._playlist) - 1))
-        else:
-            self._load_background_clip()
@@ -1,4 +1,9 @@
-"""Lightweight playback watchdog that restarts VLC if playback stalls."""
+"""Lightweight playback watchdog that restarts VLC if playback stalls.
+
+The watchdog long-polls the controller: each snapshot request returns as soon
+as VLC reports the position moving, so a request that runs into the freeze
+window unchanged is itself the sign that playback is stuck.
+"""
 
 from __future__ import annotations
 
@@ -7,7 +12,14 @@ import threading
 import time
 from typing import Callable, Optional
 
-from .vlc_controller import PlaybackSnapshot, VLCController
+from .vlc_controller import VLCController
+
+_ACTIVE_STATES = frozenset(("playing", "buffering"))
+# Consecutive healthy polls before the interval starts doubling.
+BACKOFF_AFTER_TICKS = 3
+# Ceiling for the retry delay while the controller keeps failing to report a snapshot.
+FAILURE_BACKOFF_MAX_SECONDS = 300.0
+STOP_TIMEOUT_SECONDS = 2.0
 
 
 class PlaybackWatchdog:
@@ -21,10 +33,23 @@ class PlaybackWatchdog:
         freeze_window: float = 10.0,
         min_progress_ms: int = 750,
         restart_callback: Optional[Callable[[str], None]] = None,
+        max_check_interval: float = 30.0,
     ) -> None:
         self._controller = controller
         self._logger = logger
+        self._warn = logger.warning
         self._check_interval = check_interval
+        self._max_check_interval = max(check_interval, max_check_interval)
+        # Healthy playback needs min_progress_ms of wall time to register as progress;
+        # a shorter window would report a freeze on every cycle.
+        min_window = 2 * min_progress_ms / 1000
+        if freeze_window < min_window:
+            logger.warning(
+                "freeze_window %.2fs is shorter than twice min_progress_ms; using %.2fs",
+                freeze_window,
+                min_window,
+            )
+            freeze_window = min_window
         self._freeze_window = freeze_window
         self._min_progress_ms = min_progress_ms
         self._thread: Optional[threading.Thread] = None
@@ -41,50 +66,108 @@ class PlaybackWatchdog:
 
     def stop(self) -> None:
         self._stop_event.set()
-        if self._thread:
-            self._thread.join(timeout=2.0)
+        self._controller.wake_snapshot_waiters()
+        thread = self._thread
+        if thread is None:
+            return
+        # Every wait in _run wakes on stop, so this only covers a libVLC call in flight.
+        thread.join(timeout=STOP_TIMEOUT_SECONDS)
+        if thread.is_alive():
+            self._logger.warning(
+                "Playback watchdog still busy %.1fs after stop was requested", STOP_TIMEOUT_SECONDS
+            )
+        else:
+            self._thread = None
 
     # Internal helpers -------------------------------------------------
 
     def _run(self) -> None:
-        last_snapshot: Optional[PlaybackSnapshot] = None
-        last_progress_time = time.monotonic()
-        while not self._stop_event.wait(self._check_interval):
-            snapshot = self._controller.get_snapshot()
-            now = time.monotonic()
-            if snapshot.state not in {"playing", "buffering"}:
-                last_snapshot = snapshot
+        # Settings and bound methods are fixed for the thread's lifetime; keep them local.
+        get_snapshot = self._controller.get_snapshot
+        stop_event = self._stop_event
+        monotonic = time.monotonic
+        check_interval = self._check_interval
+        max_interval = self._max_check_interval
+        freeze_window = self._freeze_window
+        min_progress_ms = self._min_progress_ms
+        # Only the fields the loop compares are kept, each read once per snapshot.
+        last_media = ""
+        last_position = -1
+        last_progress_time = monotonic()
+        interval = check_interval
+        healthy_ticks = 0
+        failures = 0
+        while not stop_event.is_set():
+            timeout = max(0.0, last_progress_time + freeze_window - monotonic())
+            try:
+                # One blocking call per cycle: while healthy it only returns once playback
+                # has moved a whole interval, yet never later than the end of the freeze window.
+                snapshot = get_snapshot(
+                    wait_for_change=(last_position, timeout),
+                    min_delta_ms=max(min_progress_ms, int(interval * 1000)),
+                    cancel=stop_event,
+                )
+            except Exception:
+                failures += 1
+                if failures == 1:
+                    self._logger.exception("Playback snapshot failed; backing off")
+                elif self._logger.isEnabledFor(logging.WARNING):
+                    self._warn("Playback snapshot still failing (%d attempts)", failures)
+                delay = check_interval * 2 ** min(failures, 16)
+                stop_event.wait(min(delay, FAILURE_BACKOFF_MAX_SECONDS))
+                # The outage itself is not evidence of a frozen picture.
+                last_progress_time = monotonic()
+                continue
+            if failures:
+                self._logger.info("Playback snapshot recovered after %d failures", failures)
+                failures = 0
+            if stop_event.is_set():
+                return
+            now = monotonic()
+            media = snapshot.media
+            position = snapshot.position_ms
+            if snapshot.state not in _ACTIVE_STATES:
+                last_media = media
+                last_position = position
                 last_progress_time = now
+                interval = check_interval
+                healthy_ticks = 0
+                # No position events arrive while stopped or paused; poll at the base rate.
+                stop_event.wait(check_interval)
                 continue
 
-            progressed = self._has_progressed(snapshot, last_snapshot)
-            if progressed:
+            delta = position - last_position
+            same_media = media == last_media
+            last_media = media
+            last_position = position
+            if same_media and delta < 0:
+                # A seek back (or a loop restart) is not forward progress, but it does
+                # start a fresh stall measurement from the new position.
                 last_progress_time = now
-                self._restart_pending = False
-            elif now - last_progress_time >= self._freeze_window:
-                self._handle_freeze(snapshot)
+                healthy_ticks = 0
+                interval = check_interval
+                continue
+            if not same_media or delta >= min_progress_ms:
                 last_progress_time = now
-            last_snapshot = snapshot
+                self._restart_pending = False
+                healthy_ticks += 1
+                if healthy_ticks >= BACKOFF_AFTER_TICKS:
+                    interval = min(interval * 2, max_interval)
+                continue
 
-    def _has_progressed(
-        self, current: PlaybackSnapshot, previous: Optional[PlaybackSnapshot]
-    ) -> bool:
-        if previous is None:
-            return True
-        if current.media != previous.media:
-            return True
-        if current.position_ms < previous.position_ms - 1000:
-            return True
-        if current.position_ms - previous.position_ms >= self._min_progress_ms:
-            return True
-        return False
+            healthy_ticks = 0
+            interval = check_interval
+            if now - last_progress_time >= freeze_window:
+                self._handle_freeze(media)
+                last_progress_time = now
 
-    def _handle_freeze(self, snapshot: PlaybackSnapshot) -> None:
-        media = snapshot.media or "<unknown>"
+    def _handle_freeze(self, media: str) -> None:
+        media = media or "<unknown>"
         if self._restart_pending:
             return
         self._restart_pending = True
-        self._logger.warning("Playback frozen on '%s'; restarting application", media)
+        if self._logger.isEnabledFor(logging.WARNING):
+            self._warn("Playback frozen on '%s'; restarting application", media)
         if not self._restart_callback:
             return
         try:
@@ -10,6 +10,8 @@ const state = {
 };
 
 const PASSWORD = "12341234";
+// Same version index.html put on this script's URL; keeps locale files cacheable.
+const ASSET_VERSION = new URL(document.currentScript.src).searchParams.get("v") || "";
 
 document.addEventListener("DOMContentLoaded", () => {
   initialise().catch((error) => console.error("Initialisation failed", error));
@@ -28,7 +30,7 @@ async function loadLocales() {
   const languages = ["fr", "en"];
   await Promise.all(
     languages.map(async (lang) => {
-      const response = await fetch(`/locales/${lang}.json`).catch(() => null);
+      const response = await fetch(`/locales/${lang}.json?v=${ASSET_VERSION}`).catch(() => null);
       if (response && response.ok) {
         state.locales[lang] = await response.json();
       }
@@ -134,7 +134,7 @@ xsetroot -solid black
 xset -dpms
 xset s off
 unclutter --timeout 0 --jitter 0 &
-cd /opt/avppi && /opt/avppi/.venv/bin/python -m uvicorn app.main:app --host 0.0.0.0 --port 8000 >>${KIOSK_LOG} 2>&1 &
+cd /opt/avppi && /opt/avppi/.venv/bin/python -m uvicorn app.main:app --host 0.0.0.0 --port 8000 --loop uvloop --http httptools >>${KIOSK_LOG} 2>&1 &
 EOF
 install -m 644 "${INSTALL_DIR}/config/openbox/rc.xml" /home/${SERVICE_USER}/.config/openbox/rc.xml
 chown -R "${SERVICE_USER}:${SERVICE_USER}" /home/${SERVICE_USER}/.config